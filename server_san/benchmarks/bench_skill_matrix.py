@@ -0,0 +1,132 @@
+"""
+Benchmark skill matrix loading on synthetic workbooks.
+
+Compares the vectorized loader in utils.excel_utils with the previous
+row-by-row (DataFrame.iterrows) conversion and checks that both produce
+identical output. Run from the server_san directory:
+
+    python -m benchmarks.bench_skill_matrix [--rows 100] [--sheets 10 50 200]
+"""
+
+import argparse
+import io
+import math
+import random
+import time
+from typing import List, Optional
+
+import pandas as pd
+
+from utils import excel_utils
+
+def build_workbook(sheet_count: int, rows_per_sheet: int) -> bytes:
+    """Create an in-memory .xlsx with a cover sheet plus sheet_count data sheets"""
+    rng = random.Random(sheet_count)
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        pd.DataFrame({"About": ["Skill matrix"]}).to_excel(writer, sheet_name="Cover", index=False)
+        for sheet_index in range(sheet_count):
+            df = pd.DataFrame({
+                "First Name": [f"First{sheet_index}_{i}" for i in range(rows_per_sheet)],
+                "Last Name": [f"Last{i}" for i in range(rows_per_sheet)],
+                "Experience (years)": [rng.randint(0, 25) for _ in range(rows_per_sheet)],
+                "Expertise": [rng.choice(["Python", "Java", "Cloud", None]) for _ in range(rows_per_sheet)],
+                "Rating": [rng.random() * 5 for _ in range(rows_per_sheet)],
+            })
+            df.to_excel(writer, sheet_name=f"Practice {sheet_index}", index=False)
+    return buffer.getvalue()
+
+def legacy_load(xls: pd.ExcelFile) -> List[dict]:
+    """The original iterrows-based conversion, kept here as the baseline"""
+    sheets_data = []
+    record_id = 1
+    for sheet_name in xls.sheet_names[1:]:
+        df = pd.read_excel(xls, sheet_name=sheet_name)
+        if len(df.columns) >= 4:
+            std_columns = ['First_Name', 'Last_Name', 'Experience', 'Expertise'] + list(df.columns[4:])
+            df = df.rename(columns={original: standard for original, standard in zip(df.columns, std_columns)})
+        records = []
+        for _, row in df.iterrows():
+            record = {"ID": record_id}
+            record.update(row.to_dict())
+            records.append(record)
+            record_id += 1
+        sheets_data.append({"Sheet Name": sheet_name, "Data": records})
+    return sheets_data
+
+def _same_value(a, b) -> bool:
+    """Equal and of the same type (NaN matches NaN)"""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, float) and math.isnan(a):
+        return math.isnan(b)
+    return a == b
+
+def find_mismatch(expected: List[dict], actual: List[dict]) -> Optional[str]:
+    """Describe the first difference between two loads (records, key order and value types), or None"""
+    if [sheet["Sheet Name"] for sheet in expected] != [sheet["Sheet Name"] for sheet in actual]:
+        return "sheet names differ"
+    for expected_sheet, actual_sheet in zip(expected, actual):
+        name = expected_sheet["Sheet Name"]
+        if len(expected_sheet["Data"]) != len(actual_sheet["Data"]):
+            return f"{name}: record counts differ"
+        for index, (expected_record, actual_record) in enumerate(zip(expected_sheet["Data"], actual_sheet["Data"])):
+            if list(expected_record) != list(actual_record):
+                return f"{name} record {index}: keys differ"
+            for key, value in expected_record.items():
+                if not _same_value(value, actual_record[key]):
+                    return f"{name} record {index} {key!r}: {value!r} ({type(value).__name__}) != {actual_record[key]!r} ({type(actual_record[key]).__name__})"
+    return None
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="rows per data sheet")
+    parser.add_argument("--sheets", type=int, nargs="+", default=[10, 50, 200], help="data sheet counts to benchmark")
+    args = parser.parse_args()
+
+    print(f"{'sheets':>7} {'records':>8} {'parse+legacy (s)':>17} {'parse+vectorized (s)':>21} {'convert legacy (s)':>19} {'convert vectorized (s)':>23}")
+    for sheet_count in args.sheets:
+        workbook = build_workbook(sheet_count, args.rows)
+
+        # Parse the sheets once so the conversion step can be timed on its own
+        xls = pd.ExcelFile(io.BytesIO(workbook))
+        frames = [excel_utils._standardize_columns(pd.read_excel(xls, sheet_name=name)) for name in xls.sheet_names[1:]]
+
+        def convert_legacy():
+            record_id, out = 1, []
+            for df in frames:
+                for _, row in df.iterrows():
+                    record = {"ID": record_id}
+                    record.update(row.to_dict())
+                    out.append(record)
+                    record_id += 1
+            return out
+
+        def convert_vectorized():
+            record_id, out = 1, []
+            for df in frames:
+                records = excel_utils._sheet_records(df, record_id)
+                record_id += len(records)
+                out.extend(records)
+            return out
+
+        _, convert_legacy_time = _timed(convert_legacy)
+        _, convert_vectorized_time = _timed(convert_vectorized)
+
+        legacy, legacy_time = _timed(legacy_load, pd.ExcelFile(io.BytesIO(workbook)))
+        vectorized, vectorized_time = _timed(excel_utils._load_sheets, pd.ExcelFile(io.BytesIO(workbook)))
+
+        mismatch = find_mismatch(legacy, vectorized)
+        if mismatch:
+            raise SystemExit(f"Output mismatch for {sheet_count} sheets: {mismatch}")
+
+        records = sum(len(sheet["Data"]) for sheet in vectorized)
+        print(f"{sheet_count:>7} {records:>8} {legacy_time:>17.3f} {vectorized_time:>21.3f} {convert_legacy_time:>19.4f} {convert_vectorized_time:>23.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 
 
 import os
+import multiprocessing
 from datetime import timedelta
 from dotenv import load_dotenv
 
@@ -12,10 +13,23 @@ load_dotenv()
 # API key for Mistral
 API_KEY = os.getenv("MISTRAL_API_KEY")
 
+# LLM client connection pool settings
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "120"))
+
 # MongoDB settings
 MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
 DATABASE_NAME = os.getenv("MONGODB_DATABASE", "resume_automation")
 USER_COLLECTION = os.getenv("MONGODB_USER_COLLECTION", "users")
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "50"))
+MONGODB_CONNECT_TIMEOUT_MS = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000"))
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGODB_SOCKET_TIMEOUT_MS = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "10000"))
+MONGODB_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000"))
 
 # Email settings
 EMAIL_SENDER = os.getenv("EMAIL_SENDER")
@@ -28,6 +42,12 @@ SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+REVOCATION_REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS", "5"))
+REVOCATION_REFRESH_OVERLAP_SECONDS = float(os.getenv("REVOCATION_REFRESH_OVERLAP_SECONDS", "60"))
+
+# Password hashing pool (bcrypt)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
 
 # Paths configuration
 BASE_PATH = os.path.dirname(os.path.abspath(__file__))
@@ -35,15 +55,71 @@ LOGO_PATH = os.path.join(BASE_PATH, os.getenv("LOGO_FILENAME", "Logo.png"))
 BP = os.path.join(BASE_PATH, os.getenv("BP_FILENAME", "BP.jpeg"))
 PROMPTS_DIR = os.path.join(BASE_PATH, os.getenv("PROMPTS_DIR", "Prompts"))
 OUTPUT_DIR = os.path.join(BASE_PATH, os.getenv("OUTPUT_DIR", "Output"))
+RENDER_DIR = os.path.join(OUTPUT_DIR, os.getenv("RENDER_DIR", "renders"))
 TEMPLATES_DIR = os.path.join(BASE_PATH, os.getenv("TEMPLATES_DIR", "templates"))
 STATIC_DIR = os.path.join(BASE_PATH, os.getenv("STATIC_DIR", "static"))
+CACHE_DIR = os.path.join(BASE_PATH, os.getenv("CACHE_DIR", "cache"))
+STORAGE_DIR = os.path.join(BASE_PATH, os.getenv("STORAGE_DIR", "storage"))
+STORAGE_DB_PATH = os.path.join(STORAGE_DIR, os.getenv("STORAGE_DB", "index.db"))
+
+# Start method for the render/extraction process pools. Forked workers would inherit the
+# parent's sockets, locks and event loop state, so a fresh interpreter is used instead
+WORKER_START_METHOD = os.getenv(
+    "WORKER_START_METHOD",
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# PDF render process pool (0 workers = render in the API threadpool)
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Upload limits (MAX_UPLOAD_BYTES 0 = unlimited)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+UPLOAD_TMP_DIR = os.path.join(CACHE_DIR, "uploads")
+
+# Document text extraction budgets (0 = unlimited)
+EXTRACT_MAX_PAGES = int(os.getenv("EXTRACT_MAX_PAGES", "0"))
+EXTRACT_MAX_CHARS = int(os.getenv("EXTRACT_MAX_CHARS", "0"))
+
+# Document extraction process pool (0 workers = extract in the API threadpool)
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+EXTRACT_PARALLEL_MIN_PAGES = int(os.getenv("EXTRACT_PARALLEL_MIN_PAGES", "16"))
+
+# Background generation jobs
+JOBS_DB_PATH = os.path.join(BASE_PATH, os.getenv("JOBS_DB", "jobs.db"))
+GENERATION_WORKERS = int(os.getenv("GENERATION_WORKERS", "4"))
+GENERATION_QUEUE_SIZE = int(os.getenv("GENERATION_QUEUE_SIZE", "100"))
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+# How often an SSE stream re-reads the job row (for jobs running in another worker)
+SSE_POLL_SECONDS = float(os.getenv("SSE_POLL_SECONDS", "2"))
+# Workers renew a lease on the jobs they own; jobs whose lease lapsed are reclaimed
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "15"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+# Retention of stored documents (0 disables the TTL / quota / sweeper)
+RETENTION_TTL_HOURS = float(os.getenv("RETENTION_TTL_HOURS", "168"))
+STORAGE_QUOTA_BYTES = int(os.getenv("STORAGE_QUOTA_BYTES", str(5 * 1024 * 1024 * 1024)))
+RETENTION_SWEEP_INTERVAL_SECONDS = float(os.getenv("RETENTION_SWEEP_INTERVAL_SECONDS", "600"))
+# Byte cap for the on-disk caches under CACHE_DIR (text, schemas, skill matrices, datasets)
+CACHE_QUOTA_BYTES = int(os.getenv("CACHE_QUOTA_BYTES", str(1024 * 1024 * 1024)))
+# Pins on stored inputs are leases in the storage index, renewed while their process is alive
+PIN_LEASE_SECONDS = float(os.getenv("PIN_LEASE_SECONDS", "300"))
+
+# Cache settings
+SCHEMA_CACHE_SIZE = int(os.getenv("SCHEMA_CACHE_SIZE", "128"))
+TEXT_CACHE_SIZE = int(os.getenv("TEXT_CACHE_SIZE", "256"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+SKILL_MATRIX_CACHE_ENABLED = os.getenv("SKILL_MATRIX_CACHE_ENABLED", "true").lower() == "true"
+MAX_LOADED_DATASETS = int(os.getenv("MAX_LOADED_DATASETS", "8"))
 
 # Create required directories
 os.makedirs(OUTPUT_DIR, exist_ok=True)
+os.makedirs(RENDER_DIR, exist_ok=True)
 os.makedirs(PROMPTS_DIR, exist_ok=True)
 os.makedirs(TEMPLATES_DIR, exist_ok=True)
 os.makedirs(STATIC_DIR, exist_ok=True)
-
-# Global variables to store loaded skill matrix data
-sheets_data = []
-names_list = []
\ No newline at end of file
+os.makedirs(CACHE_DIR, exist_ok=True)
+os.makedirs(UPLOAD_TMP_DIR, exist_ok=True)
+os.makedirs(STORAGE_DIR, exist_ok=True)
\ No newline at end of file
@@ -8,9 +8,9 @@ import os
 import logging
 
 import config
-from services import data_service
+from services import data_service, llm_client, mongo_client, job_service, storage_service, retention_service, password_hasher, revocation_service, mongo_schema
 from routers import upload, search, generate, auth
-from utils import template_manager
+from utils import template_manager, extract_pool, render_engine
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -87,6 +87,31 @@ async def options_handler(request: Request, full_path: str):
 async def startup_event():
     logger.info("Starting up the application")
     
+    # Start the worker processes before any client, socket or background task exists
+    # Warm up the document extraction workers
+    extract_pool.start()
+    
+    # Warm up the PDF render workers
+    render_engine.start()
+    
+    # Open the shared LLM connection pool
+    llm_client.init_client()
+    
+    # Open the shared MongoDB connection pool
+    mongo_client.init_client()
+    
+    # Make sure every auth query has its index; conflicts abort startup
+    await mongo_schema.ensure_indexes()
+    
+    # Load revoked tokens and keep them in sync
+    await revocation_service.start()
+    
+    # Start the background generation workers
+    await job_service.start()
+    
+    # Start the storage retention sweeper
+    retention_service.start()
+    
     # Create default prompts
     data_service.create_prompts()
     
@@ -100,6 +125,38 @@ async def startup_event():
     for template in templates_info['cover_letter_templates']:
         logger.info(f"  - Template {template['id']}: {template['name']}")
 
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    logger.info("Shutting down the application")
+    
+    # Stop the retention sweeper
+    await retention_service.stop()
+    
+    # Stop generation workers; unfinished jobs are resumed on the next start
+    await job_service.stop()
+    
+    # Release pooled LLM connections
+    await llm_client.close_client()
+    
+    # Stop the revocation refresh task
+    await revocation_service.stop()
+    
+    # Release pooled MongoDB connections
+    mongo_client.close_client()
+    
+    # Stop the password hashing pool
+    password_hasher.shutdown()
+    
+    # Stop the document extraction workers
+    extract_pool.stop()
+    
+    # Stop the PDF render workers
+    render_engine.stop()
+    
+    # Close the storage index
+    storage_service.close()
+
 # Mount static files directory 
 app.mount("/static", StaticFiles(directory=config.STATIC_DIR), name="static")
 
@@ -2,20 +2,16 @@
 
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
-from services import auth_service
+from services import auth_service, revocation_service
 import jwt
 import config
-from pymongo import MongoClient
 import logging
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# MongoDB connection for token blacklist
-client = MongoClient(config.MONGODB_URL)
-db = client[config.DATABASE_NAME]
-blacklist_collection = db["token_blacklist"]
+# Revoked tokens are checked against the in-process set kept by revocation_service
 
 async def auth_middleware(request: Request, call_next):
     # Log the request path for debugging
@@ -60,7 +56,7 @@ async def auth_middleware(request: Request, call_next):
             )
         
         # Check if token is blacklisted
-        if blacklist_collection.find_one({"token": token}):
+        if await revocation_service.is_revoked(token):
             logger.warning(f"Blacklisted token detected")
             return JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -5,6 +5,7 @@ from datetime import datetime
 class NameQuery(BaseModel):
     first_name: str
     last_name: str
+    dataset_id: str  # Skill matrix dataset returned by the upload endpoints
 
 class EmployeeInfo(BaseModel):
     ID: int
@@ -18,9 +19,11 @@ class ResumeRequest(BaseModel):
     old_cover_letter_path: Optional[str] = None
     cover_letter_path: Optional[str] = None  # Alternative name
     skill_matrix_path: Optional[str] = None
+    dataset_id: Optional[str] = None  # Skill matrix dataset returned by the upload endpoints (or skill_matrix_path)
     first_name: Optional[str] = None
     last_name: Optional[str] = None
     template_id: Optional[int] = 1  # Change parameter name from template_type to template_id
+    persist: Optional[bool] = False  # /generate/resume/pdf: also keep a stored copy
     
     # Add a method to get the cover letter path from either field
     def get_cover_letter_path(self):
@@ -28,6 +31,15 @@ class ResumeRequest(BaseModel):
 
 class EmployeeIdQuery(BaseModel):
     employee_id: int
+    dataset_id: str  # Skill matrix dataset returned by the upload endpoints
+
+class BatchResumeRequest(BaseModel):
+    template_path: str
+    skill_matrix_path: Optional[str] = None
+    dataset_id: Optional[str] = None  # Either this or skill_matrix_path is required
+    sheet_name: Optional[str] = None  # Limit the batch to one sheet (practice)
+    employee_ids: Optional[List[int]] = None  # IDs from /upload/extract-employees
+    template_id: Optional[int] = 1
 
 
 
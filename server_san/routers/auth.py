@@ -203,8 +203,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 import config
 from models.schema import UserCreate, User, Token,ChangePasswordRequest
-from services import auth_service
-from pymongo import MongoClient
+from services import auth_service, mongo_client, password_hasher, revocation_service, mongo_schema
 import logging
 from pydantic import BaseModel
 from typing import Optional
@@ -222,11 +221,7 @@ router = APIRouter(
     responses={401: {"description": "Unauthorized"}},
 )
 
-# MongoDB connection for token blacklist
-client = MongoClient(config.MONGODB_URL)
-db = client[config.DATABASE_NAME]
-blacklist_collection = db["token_blacklist"]
-users_collection = db[config.USER_COLLECTION]
+# MongoDB collections come from the shared async client (services/mongo_client.py)
 
 # Define schema models
 class ForgotPasswordRequest(BaseModel):
@@ -241,7 +236,7 @@ async def signup(user_data: UserCreate):
     """Register a new user"""
     try:
         # Check if username already exists
-        existing_user = users_collection.find_one({"username": user_data.username})
+        existing_user = await mongo_client.users().find_one({"username": user_data.username})
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -249,7 +244,7 @@ async def signup(user_data: UserCreate):
             )
         
         # Check if email already exists
-        existing_email = users_collection.find_one({"email": user_data.email})
+        existing_email = await mongo_client.users().find_one({"email": user_data.email})
         if existing_email:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -311,7 +306,7 @@ async def logout(response: Response, current_user: User = Depends(auth_service.g
     """Logout and invalidate the current token"""
     try:
         # Add token to blacklist
-        blacklist_collection.insert_one({"token": token})
+        await revocation_service.revoke(token)
         return {"message": "Successfully logged out"}
     except Exception as e:
         logger.error(f"Logout error: {str(e)}")
@@ -504,11 +499,11 @@ async def debug_tokens(token: Optional[str] = None):
     """
     Debug endpoint to check token database
     """
-    password_reset_collection = db["password_reset_tokens"]
+    password_reset_collection = mongo_client.password_resets()
     
     if token:
         # Look for a specific token
-        token_data = password_reset_collection.find_one({"token": token})
+        token_data = await password_reset_collection.find_one({"token": token})
         if token_data:
             # Convert ObjectId to string for JSON serialization
             token_data["_id"] = str(token_data["_id"])
@@ -520,7 +515,7 @@ async def debug_tokens(token: Optional[str] = None):
             return {"found": False, "message": "Token not found in database"}
     else:
         # Get count of tokens
-        count = password_reset_collection.count_documents({})
+        count = await password_reset_collection.count_documents({})
         return {"token_count": count}
 
 
@@ -551,24 +546,24 @@ async def change_password(
         
         # Get user from database by username or email
         # Try to find by username first
-        user = users_collection.find_one({"username": current_user.username})
+        user = await mongo_client.users().find_one({"username": current_user.username})
         if not user:
             # Try email as fallback
-            user = users_collection.find_one({"email": current_user.email})
+            user = await mongo_client.users().find_one({"email": current_user.email})
             if not user:
                 logger.warning(f"User not found with username: {current_user.username}")
                 raise HTTPException(status_code=404, detail="User not found")
         
         # Verify current password
-        if not auth_service.verify_password(current_password, user["hashed_password"]):
+        if not await auth_service.verify_password_async(current_password, user["hashed_password"]):
             logger.warning(f"Incorrect password attempt for user: {current_user.username}")
             raise HTTPException(status_code=400, detail="Current password is incorrect")
         
         # Hash the new password
-        hashed_password = auth_service.get_password_hash(new_password)
+        hashed_password = await auth_service.get_password_hash_async(new_password)
         
         # Update the password in the database
-        result = users_collection.update_one(
+        result = await mongo_client.users().update_one(
             {"_id": user["_id"]}, 
             {"$set": {"hashed_password": hashed_password}}
         )
@@ -576,6 +571,7 @@ async def change_password(
         if result.modified_count == 0:
             logger.error(f"Failed to update password for user: {current_user.username}")
             raise HTTPException(status_code=500, detail="Failed to update password")
+        auth_service.invalidate_cached_user(user.get("username"))
         
         logger.info(f"Password successfully updated for user: {current_user.username}")
         return {"detail": "Password updated successfully"}
@@ -585,4 +581,19 @@ async def change_password(
         logger.error(f"Error changing password: {str(e)}")
         import traceback
         logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@router.get("/user-cache/metrics")
+async def user_cache_metrics():
+    """Size and hit rate of the get_current_user cache"""
+    return auth_service.get_user_cache_metrics()
+
+@router.get("/indexes/status")
+async def index_status():
+    """Build status of the MongoDB indexes ensured at startup"""
+    return mongo_schema.get_status()
+
+@router.get("/password-hasher/metrics")
+async def password_hasher_metrics():
+    """Queue depth and latency of the bcrypt hashing pool"""
+    return password_hasher.get_metrics()
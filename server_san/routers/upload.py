@@ -1,9 +1,11 @@
 from fastapi import APIRouter, File, UploadFile, HTTPException
 from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 import os
 from typing import List
 import config
-from utils import file_utils, excel_utils
+from services import dataset_registry, storage_service, text_cache
+from utils import excel_utils, upload_utils
 
 router = APIRouter(prefix="/upload", tags=["uploads"])
 
@@ -17,14 +19,14 @@ async def upload_resume(file: UploadFile = File(...)):
     if file_extension not in ['pdf', 'docx', 'txt']:
         raise HTTPException(status_code=400, detail="Unsupported file format. Please upload PDF, DOCX, or TXT files.")
     
-    # Save the file
-    file_path = os.path.join(config.OUTPUT_DIR, filename)
-    with open(file_path, "wb") as buffer:
-        buffer.write(await file.read())
+    # Stream the file into content-addressed storage
+    stored = await storage_service.save_upload(file, filename)
+    file_path = stored.path
     
     # Extract text from the file
     try:
-        extracted_text = file_utils.extract_text_from_file(file_path)
+        # Extract once and keep the text for later generations of the same document
+        extracted_text = await text_cache.get_text_async(file_path, stored.digest)
         return {
             "filename": filename,
             "file_path": file_path,
@@ -32,9 +34,9 @@ async def upload_resume(file: UploadFile = File(...)):
             "message": "File uploaded and processed successfully"
         }
     except Exception as e:
-        # If there's an error, remove the uploaded file
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # If there's an error, drop the uploaded file (unless an earlier upload already stored it)
+        if stored.is_new:
+            await run_in_threadpool(storage_service.release, filename, stored.digest)
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
 @router.post("/skill-matrix", response_model=dict)
@@ -47,30 +49,27 @@ async def upload_skill_matrix(file: UploadFile = File(...)):
     if file_extension not in ['xlsx', 'xls']:
         raise HTTPException(status_code=400, detail="Unsupported file format. Please upload Excel files only.")
     
-    # Save the file
-    file_path = os.path.join(config.OUTPUT_DIR, filename)
-    with open(file_path, "wb") as buffer:
-        buffer.write(await file.read())
+    # Stream the file into content-addressed storage
+    stored = await storage_service.save_upload(file, filename)
+    file_path = stored.path
     
     # Process the Excel file
     try:
-        sheet_data = excel_utils.load_skill_matrix(file_path)
-        
-        # Count total records across all sheets
-        total_records = sum(len(sheet["Data"]) for sheet in sheet_data)
+        dataset = await run_in_threadpool(dataset_registry.load_file, file_path, filename, stored.digest)
         
         return {
             "filename": filename,
             "file_path": file_path,
+            "dataset_id": dataset.dataset_id,
             "status": "success",
-            "sheets_processed": len(sheet_data),
-            "total_records": total_records,
+            "sheets_processed": len(dataset.sheets_data),
+            "total_records": dataset.total_records,
             "message": "Skill matrix uploaded and processed successfully"
         }
     except Exception as e:
-        # If there's an error, remove the uploaded file
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # If there's an error, drop the uploaded file (unless an earlier upload already stored it)
+        if stored.is_new:
+            await run_in_threadpool(storage_service.release, filename, stored.digest)
         raise HTTPException(status_code=500, detail=f"Error processing skill matrix: {str(e)}")
 
 @router.post("/extract-employees", response_model=dict)
@@ -83,35 +82,24 @@ async def extract_employees(skillMatrix: UploadFile = File(...)):
     if file_extension not in ['xlsx', 'xls']:
         raise HTTPException(status_code=400, detail="Unsupported file format. Please upload Excel files only.")
     
-    # Read the file content
-    content = await skillMatrix.read()
+    # Stream the workbook to a temporary file instead of holding it in memory
+    temp_path, digest = await upload_utils.save_upload_temp(skillMatrix, f".{file_extension}")
     
     try:
-        # Process the Excel file from bytes
-        sheets_data = excel_utils.load_skill_matrix_from_bytes(content)
+        # Process the Excel file from disk
+        dataset = await run_in_threadpool(dataset_registry.load_file, temp_path, filename, digest)
         
         # Debug output
-        print(f"Loaded {len(sheets_data)} sheets with data")
-        print(f"Global sheets_data now has {len(config.sheets_data)} sheets")
+        print(f"Loaded {len(dataset.sheets_data)} sheets with data into dataset {dataset.dataset_id}")
         
         # Extract employee list
         employees = []
         
-        for sheet in sheets_data:
+        for sheet in dataset.sheets_data:
             sheet_name = sheet["Sheet Name"]
             for record in sheet["Data"]:
                 # Extract first name and last name considering both standardized and original column names
-                first_name = None
-                for key in ["First_Name", "First Name"]:
-                    if key in record and isinstance(record[key], str):
-                        first_name = record[key]
-                        break
-                
-                last_name = None
-                for key in ["Last_Name", "Last Name"]:
-                    if key in record and isinstance(record[key], str):
-                        last_name = record[key]
-                        break
+                first_name, last_name = excel_utils.get_employee_name(record)
                 
                 if first_name and last_name:
                     employees.append({
@@ -124,8 +112,11 @@ async def extract_employees(skillMatrix: UploadFile = File(...)):
         
         return {
             "success": True,
+            "dataset_id": dataset.dataset_id,
             "employees": employees,
             "message": f"Successfully extracted {len(employees)} employees from skill matrix"
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error extracting employees: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error extracting employees: {str(e)}")
+    finally:
+        upload_utils.remove_upload(temp_path)
\ No newline at end of file
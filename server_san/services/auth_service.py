@@ -551,14 +551,14 @@
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from pymongo import MongoClient
 from bson import ObjectId
 import config
 import secrets
 from models.schema import UserInDB, User, TokenData
+from services import mongo_client, password_hasher, revocation_service
+from utils.cache_utils import TTLCache
 import logging
 import traceback
 import urllib.parse
@@ -567,16 +567,29 @@ import urllib.parse
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing (bcrypt runs on the bounded pool in services/password_hasher.py)
+pwd_context = password_hasher.pwd_context
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# MongoDB connection
-client = MongoClient(config.MONGODB_URL)
-db = client[config.DATABASE_NAME]
-users_collection = db[config.USER_COLLECTION]
-blacklist_collection = db["token_blacklist"]
-password_reset_collection = db["password_reset_tokens"]
+# MongoDB collections come from the shared async client (services/mongo_client.py)
+
+# Users resolved by get_current_user, keyed by username. Entries expire after
+# USER_CACHE_TTL_SECONDS and are dropped explicitly whenever the user changes.
+_user_cache = TTLCache(config.USER_CACHE_SIZE, config.USER_CACHE_TTL_SECONDS)
+
+def invalidate_cached_user(username: Optional[str]):
+    """Drop a user from the get_current_user cache after it changes (password, status, signup)"""
+    if username:
+        _user_cache.pop(username)
+
+def get_user_cache_metrics():
+    return {
+        "entries": len(_user_cache),
+        "max_entries": _user_cache.max_entries,
+        "ttl_seconds": _user_cache.ttl_seconds,
+        "hits": _user_cache.hits,
+        "misses": _user_cache.misses,
+    }
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -584,8 +597,30 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+def _hasher_busy(error: password_hasher.PasswordHasherBusyError) -> HTTPException:
+    logger.warning(f"Password hashing pool saturated: {str(error)}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+async def verify_password_async(plain_password, hashed_password):
+    """verify_password on the hashing pool; raises 503 when the pool is saturated"""
+    try:
+        return await password_hasher.verify_password(plain_password, hashed_password)
+    except password_hasher.PasswordHasherBusyError as e:
+        raise _hasher_busy(e)
+
+async def get_password_hash_async(password):
+    """get_password_hash on the hashing pool; raises 503 when the pool is saturated"""
+    try:
+        return await password_hasher.hash_password(password)
+    except password_hasher.PasswordHasherBusyError as e:
+        raise _hasher_busy(e)
+
 async def get_user(username: str):
-    user_dict = users_collection.find_one({"username": username})
+    user_dict = await mongo_client.users().find_one({"username": username})
     if user_dict:
         # Convert _id to string id
         user_dict["id"] = str(user_dict.pop("_id"))
@@ -603,7 +638,7 @@ async def get_user(username: str):
     return None
 
 async def get_user_by_email(email: str):
-    user_dict = users_collection.find_one({"email": email})
+    user_dict = await mongo_client.users().find_one({"email": email})
     if user_dict:
         # Convert _id to string id
         user_dict["id"] = str(user_dict.pop("_id"))
@@ -624,7 +659,7 @@ async def authenticate_user(username: str, password: str):
     user = await get_user(username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return False
     return user
 
@@ -635,12 +670,12 @@ async def authenticate_user_by_email_or_username(login_id: str, password: str):
     # First try to authenticate by email (if it looks like an email)
     if "@" in login_id:
         user = await get_user_by_email(login_id)
-        if user and verify_password(password, user.hashed_password):
+        if user and await verify_password_async(password, user.hashed_password):
             return user
     
     # If not found or not an email, try username
     user = await get_user(login_id)
-    if user and verify_password(password, user.hashed_password):
+    if user and await verify_password_async(password, user.hashed_password):
         return user
     
     return False
@@ -651,13 +686,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": revocation_service.new_token_id()})
     encoded_jwt = jwt.encode(to_encode, config.SECRET_KEY, algorithm=config.ALGORITHM)
     return encoded_jwt
 
-def is_token_blacklisted(token: str):
-    """Check if a token is in the blacklist"""
-    return blacklist_collection.find_one({"token": token}) is not None
+async def is_token_blacklisted(token: str):
+    """Check if a token has been revoked (answered from the in-process revocation set)"""
+    return await revocation_service.is_revoked(token)
 
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
@@ -667,7 +702,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     )
     
     # Check if token is blacklisted
-    if is_token_blacklisted(token):
+    if await is_token_blacklisted(token):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has been revoked",
@@ -684,18 +719,24 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         logger.error("JWT Error during token validation")
         raise credentials_exception
     
+    cached = _user_cache.get(token_data.username)
+    if cached is not None:
+        return cached
+    
     user = await get_user(username=token_data.username)
     if user is None:
         logger.error(f"User not found: {token_data.username}")
         raise credentials_exception
     
-    return User(
+    current_user = User(
         id=user.id,
         username=user.username,
         email=user.email,
         is_active=user.is_active,
         created_at=user.created_at
     )
+    _user_cache.put(current_user.username, current_user)
+    return current_user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
     if not current_user.is_active:
@@ -732,10 +773,10 @@ async def generate_password_reset_token(email: str):
         
         # Store token in database
         # Delete any existing tokens for this user
-        password_reset_collection.delete_many({"user_id": user.id})
+        await mongo_client.password_resets().delete_many({"user_id": user.id})
         
         # Insert new token - store both the random token and JWT
-        password_reset_collection.insert_one({
+        await mongo_client.password_resets().insert_one({
             "user_id": user.id,
             "email": email,
             "token": reset_token,  # URL-safe random token
@@ -763,8 +804,7 @@ async def verify_password_reset_token(token: str):
         cleaned_token = urllib.parse.unquote(token)
         logger.info(f"Verifying token: {cleaned_token[:10]}...")
         
-        password_reset_collection = db["password_reset_tokens"]
-        token_data = password_reset_collection.find_one({"token": cleaned_token})
+        token_data = await mongo_client.password_resets().find_one({"token": cleaned_token})
         
         # Log whether token was found
         if not token_data:
@@ -810,14 +850,14 @@ async def reset_password(token: str, new_password: str):
         user_id = token_data["user_id"]
         
         # Get the user to confirm they exist
-        user_obj = users_collection.find_one({"_id": ObjectId(user_id)})
+        user_obj = await mongo_client.users().find_one({"_id": ObjectId(user_id)})
         if not user_obj:
             logger.error(f"User not found with ID: {user_id}")
             return False
         
         # Update password
-        hashed_password = get_password_hash(new_password)
-        result = users_collection.update_one(
+        hashed_password = await get_password_hash_async(new_password)
+        result = await mongo_client.users().update_one(
             {"_id": ObjectId(user_id)},
             {"$set": {"hashed_password": hashed_password}}
         )
@@ -825,15 +865,18 @@ async def reset_password(token: str, new_password: str):
         if result.modified_count == 0:
             logger.error(f"Failed to update password for user ID: {user_id}")
             return False
+        invalidate_cached_user(user_obj.get("username"))
         
         # Mark token as used
-        password_reset_collection.update_one(
+        await mongo_client.password_resets().update_one(
             {"token": cleaned_token},
             {"$set": {"is_used": True}}
         )
         
         logger.info(f"Password successfully reset for user ID: {user_id}")
         return True
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error resetting password: {str(e)}")
         logger.error(traceback.format_exc())
@@ -842,22 +885,23 @@ async def reset_password(token: str, new_password: str):
 async def create_user(user_data):
     try:
         # Only check if email already exists, not username
-        existing_email = users_collection.find_one({"email": user_data.email})
+        existing_email = await mongo_client.users().find_one({"email": user_data.email})
         if existing_email:
             logger.info(f"Email already exists: {user_data.email}")
             return None
         
         # Create new user
         user_dict = user_data.dict()
-        user_dict["hashed_password"] = get_password_hash(user_dict.pop("password"))
+        user_dict["hashed_password"] = await get_password_hash_async(user_dict.pop("password"))
         user_dict["created_at"] = datetime.utcnow()
         
         # Ensure is_active is set
         if "is_active" not in user_dict:
             user_dict["is_active"] = True
         
-        result = users_collection.insert_one(user_dict)
-        new_user = users_collection.find_one({"_id": result.inserted_id})
+        result = await mongo_client.users().insert_one(user_dict)
+        invalidate_cached_user(user_dict.get("username"))
+        new_user = await mongo_client.users().find_one({"_id": result.inserted_id})
         
         if new_user:
             new_user["id"] = str(new_user.pop("_id"))
@@ -869,6 +913,9 @@ async def create_user(user_data):
                 created_at=new_user["created_at"]
             )
         return None
+    except HTTPException:
+        # 503 from a saturated hashing pool must reach the client as is
+        raise
     except Exception as e:
         logger.error(f"Error creating user: {str(e)}")
         logger.error(traceback.format_exc())
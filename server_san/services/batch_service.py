@@ -0,0 +1,112 @@
+"""
+Bulk resume generation for every selected employee of a skill matrix.
+
+The template schema is computed once, the per-employee LLM calls and PDF
+renders fan out with bounded concurrency, and the finished PDFs are
+streamed back as a ZIP archive in completion order.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import traceback
+import zipfile
+from typing import AsyncIterator, Dict, List, Optional
+
+import config
+from models.schema import BatchResumeRequest
+from services import data_service, generation_service, schema_cache, storage_service
+from utils import excel_utils
+
+logger = logging.getLogger(__name__)
+
+class _ZipStreamBuffer:
+    """Write-only file object that hands the bytes written by ZipFile to the response"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def select_employees(sheets_data: List[dict], sheet_name: Optional[str] = None, employee_ids: Optional[List[int]] = None) -> List[dict]:
+    """Return the records (with their sheet name) selected for a batch"""
+    wanted_ids = set(employee_ids) if employee_ids else None
+    selected = []
+    for sheet in sheets_data:
+        if sheet_name and sheet["Sheet Name"] != sheet_name:
+            continue
+        for record in sheet["Data"]:
+            if wanted_ids is not None and record.get("ID") not in wanted_ids:
+                continue
+            first_name, last_name = excel_utils.get_employee_name(record)
+            if not (first_name and last_name):
+                continue
+            record_with_sheet = record.copy()
+            record_with_sheet["Sheet Name"] = sheet["Sheet Name"]
+            selected.append(record_with_sheet)
+    return selected
+
+def _archive_name(record: dict) -> str:
+    first_name, last_name = excel_utils.get_employee_name(record)
+    safe_name = re.sub(r"[^A-Za-z0-9_-]+", "_", f"{first_name}_{last_name}").strip("_")
+    return f"{record['ID']}_{safe_name}_Resume.pdf"
+
+async def _generate_one(schema: Dict, record: dict, template_id: int, semaphore: asyncio.Semaphore) -> Dict:
+    async with semaphore:
+        try:
+            # Same skill matrix payload as /generate/resume sends for a name lookup
+            skill_matrix_json = json.dumps([record], default=str)
+            resume_data = await data_service.process_resume_data_async(schema, None, None, skill_matrix_json)
+            # Rendered in memory and written straight into the archive; a template
+            # failure is reported in the manifest rather than zipped as an error PDF
+            _, pdf_bytes = await generation_service.render_resume_bytes(resume_data, template_id, fallback=False)
+            return {"record": record, "pdf": pdf_bytes}
+        except Exception as e:
+            logger.error(f"Batch generation failed for employee {record.get('ID')}: {str(e)}")
+            logger.error(traceback.format_exc())
+            return {"record": record, "error": str(e)}
+
+async def stream_batch_zip(request: BatchResumeRequest, employees: List[dict]) -> AsyncIterator[bytes]:
+    """Generate a resume for each employee and yield a ZIP archive as PDFs finish"""
+    template_id = request.template_id if request.template_id is not None else 1
+    with storage_service.pinned(request.template_path):
+        schema = await schema_cache.get_template_schema(request.template_path)
+
+    semaphore = asyncio.Semaphore(config.BATCH_CONCURRENCY)
+    tasks = [asyncio.create_task(_generate_one(schema, record, template_id, semaphore)) for record in employees]
+
+    buffer = _ZipStreamBuffer()
+    archive = zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED)
+    manifest = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            outcome = await next_done
+            record = outcome["record"]
+            entry = {"ID": record.get("ID"), "sheet_name": record.get("Sheet Name")}
+            if "error" in outcome:
+                entry.update({"status": "failed", "error": outcome["error"]})
+            else:
+                arcname = _archive_name(record)
+                archive.writestr(arcname, outcome["pdf"])
+                entry.update({"status": "generated", "file": arcname})
+            manifest.append(entry)
+            yield buffer.drain()
+
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+        archive.close()
+        yield buffer.drain()
+    finally:
+        # Client went away or something failed mid-stream: stop outstanding work
+        for task in tasks:
+            task.cancel()
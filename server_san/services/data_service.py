@@ -1,6 +1,6 @@
 import json
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import config
 # from utils import file_utils
 from utils import *
@@ -51,43 +51,129 @@ Follow these guidelines:
 8. Ensure all JSON is properly formatted and valid.
             """)
 
+def default_template_schema() -> Dict:
+    """Schema used when the template cannot be turned into JSON"""
+    return {
+        "name": "",
+        "designation": "",
+        "objective": "",
+        "education": [],
+        "skills": [],
+        "project_details": {}
+    }
+
+def _parse_template_json(template_json_str: str) -> Dict:
+    """Parse the LLM_CALL_1 output into the template schema"""
+    # Clean up the JSON string to ensure it's valid
+    template_json_str = template_json_str.replace('```json', '').replace('```', '').strip()
+    
+    try:
+        print("template_json_str",template_json_str)
+        print("type of the json schema",type(template_json_str))
+        formatted_json_schema = json.loads(template_json_str)
+        print("Type of the formatted Json after loads:",type(formatted_json_schema))
+        
+        return formatted_json_schema
+    except json.JSONDecodeError as e:
+        # If template JSON parsing fails, use a default schema
+        print(f"Error parsing template JSON: {e}, using default schema")
+        return default_template_schema()
+
 def process_template_json(template_text: str) -> Dict:
     """Process template and extract JSON schema"""
     try:
-        template_json_str = llm_service.LLM_CALL_1(template_text)
-        
-        # Clean up the JSON string to ensure it's valid
-        template_json_str = template_json_str.replace('```json', '').replace('```', '').strip()
-        
-        try:
-            print("template_json_str",template_json_str)
-            print("type of the json schema",type(template_json_str))
-            formatted_json_schema = json.loads(template_json_str)
-            print("Type of the formatted Json after loads:",type(formatted_json_schema))
-            
-            return formatted_json_schema
-        except json.JSONDecodeError as e:
-            # If template JSON parsing fails, use a default schema
-            print(f"Error parsing template JSON: {e}, using default schema")
-            return {
-                "name": "",
-                "designation": "",
-                "objective": "",
-                "education": [],
-                "skills": [],
-                "project_details": {}
-            }
+        return _parse_template_json(llm_service.LLM_CALL_1(template_text))
+    except Exception as e:
+        print(f"Error in LLM_CALL_1: {str(e)}")
+        # Use default schema if LLM call fails
+        return default_template_schema()
+
+async def process_template_json_async(template_text: str) -> Dict:
+    """Async variant of process_template_json"""
+    try:
+        return _parse_template_json(await llm_service.LLM_CALL_1_async(template_text))
     except Exception as e:
         print(f"Error in LLM_CALL_1: {str(e)}")
         # Use default schema if LLM call fails
-        return {
-            "name": "",
-            "designation": "",
-            "objective": "",
-            "education": [],
-            "skills": [],
-            "project_details": {}
+        return default_template_schema()
+
+def _guess_name(old_resume_text: Optional[str]) -> str:
+    """Extract a candidate name from the old resume using a simple heuristic"""
+    name = "Candidate"
+    if old_resume_text:
+        for line in old_resume_text.split('\n'):
+            if line.strip() and len(line.strip()) < 50:  # Simple heuristic to find a name
+                name = line.strip()
+                break
+    return name
+
+def _minimal_resume_data(name: str, detail: str = "extracted") -> Dict:
+    """Minimal valid resume data used when nothing usable came back from the LLM"""
+    return {
+        "name": name,
+        "designation": "Professional",
+        "objective": "Experienced professional seeking new opportunities.",
+        "education": [f"Education details not {detail}"],
+        "skills": [f"Skills not {detail}"],
+        "project_details": {
+            "project1": {
+                "name": "Project",
+                "role": "Team Member",
+                "description": f"Project description not {detail}",
+                "technology": f"Technologies not {detail}",
+                "role_played": f"Role details not {detail}"
+            }
         }
+    }
+
+def _select_resume_call(
+    formatted_json_schema: Dict,
+    old_resume_text: Optional[str],
+    old_cover_letter_text: Optional[str],
+    skill_matrix_json: Optional[str]
+) -> Optional[Tuple[str, tuple]]:
+    """Pick the LLM call (and its arguments) that matches the available inputs"""
+    if old_resume_text and old_cover_letter_text and skill_matrix_json:
+        # All three inputs available
+        return "LLM_CALL_8", (formatted_json_schema, old_resume_text, old_cover_letter_text, skill_matrix_json)
+    elif old_resume_text and skill_matrix_json:
+        # Old resume and skill matrix
+        return "LLM_CALL_2", (formatted_json_schema, old_resume_text, skill_matrix_json)
+    elif old_cover_letter_text and skill_matrix_json:
+        # Cover letter and skill matrix
+        return "LLM_CALL_3", (formatted_json_schema, old_cover_letter_text, skill_matrix_json)
+    elif old_resume_text and old_cover_letter_text:
+        # Old resume and cover letter
+        return "LLM_CALL_4", (formatted_json_schema, old_resume_text, old_cover_letter_text)
+    elif old_resume_text:
+        # Only old resume
+        return "LLM_CALL_5", (formatted_json_schema, old_resume_text)
+    elif old_cover_letter_text:
+        # Only cover letter
+        return "LLM_CALL_6", (formatted_json_schema, old_cover_letter_text)
+    elif skill_matrix_json:
+        # Only skill matrix
+        return "LLM_CALL_7", (formatted_json_schema, skill_matrix_json)
+    # No inputs provided
+    return None
+
+def _parse_resume_content(resume_content: str, old_resume_text: Optional[str]) -> Dict:
+    """Turn the LLM output into resume data, falling back to minimal data"""
+    # Ensure we have valid JSON
+    try:
+        resume_data = json.loads(resume_content)
+        return resume_data
+    except json.JSONDecodeError as e:
+        # Clean up the JSON if necessary
+        print(f"Error parsing generated JSON: {e}, attempting to clean")
+        clean_json = resume_content.replace('```json', '').replace('```', '').strip()
+        try:
+            resume_data = json.loads(clean_json)
+            return resume_data
+        except json.JSONDecodeError:
+            # If still failing, create minimal valid JSON
+            print("Error parsing cleaned JSON, using minimal data")
+            return _minimal_resume_data(_guess_name(old_resume_text))
 
 def process_resume_data(
     formatted_json_schema: Dict,
@@ -98,114 +184,36 @@ def process_resume_data(
     """Process input data and generate resume JSON based on available inputs"""
     try:
         # Call appropriate LLM function based on available inputs
-        if old_resume_text and old_cover_letter_text and skill_matrix_json:
-            # All three inputs available
-            resume_content = llm_service.LLM_CALL_8(formatted_json_schema, old_resume_text, old_cover_letter_text, skill_matrix_json)
-            print("Resume content after LLM_CALL_8",resume_content)
-        elif old_resume_text and skill_matrix_json:
-            # Old resume and skill matrix
-            resume_content = llm_service.LLM_CALL_2(formatted_json_schema, old_resume_text, skill_matrix_json)
-            print("Resume content after LLM_CALL_2",resume_content)
-        elif old_cover_letter_text and skill_matrix_json:
-            # Cover letter and skill matrix
-            resume_content = llm_service.LLM_CALL_3(formatted_json_schema, old_cover_letter_text, skill_matrix_json)
-            print("Resume content after LLM_CALL_3",resume_content)
-        elif old_resume_text and old_cover_letter_text:
-            # Old resume and cover letter
-            resume_content = llm_service.LLM_CALL_4(formatted_json_schema, old_resume_text, old_cover_letter_text)
-            print("Resume content after LLM_CALL_4",resume_content)
-        elif old_resume_text:
-            # Only old resume
-            resume_content = llm_service.LLM_CALL_5(formatted_json_schema, old_resume_text)
-            print("Resume content after LLM_CALL_5",resume_content)
-        elif old_cover_letter_text:
-            # Only cover letter
-            resume_content = llm_service.LLM_CALL_6(formatted_json_schema, old_cover_letter_text)
-            print("Resume content after LLM_CALL_6",resume_content)
-        elif skill_matrix_json:
-            # Only skill matrix
-            resume_content = llm_service.LLM_CALL_7(formatted_json_schema, skill_matrix_json)
-            print("Resume content after LLM_CALL_7",resume_content)
-        else:
-            # No inputs provided
-            return {
-                "name": "Candidate",
-                "designation": "Professional",
-                "objective": "Experienced professional seeking new opportunities.",
-                "education": ["Education details not provided"],
-                "skills": ["Skills not provided"],
-                "project_details": {
-                    "project1": {
-                        "name": "Project",
-                        "role": "Team Member",
-                        "description": "Project description not provided",
-                        "technology": "Technologies not provided",
-                        "role_played": "Role details not provided"
-                    }
-                }
-            }
-            
-        # Ensure we have valid JSON
-        try:
-            resume_data = json.loads(resume_content)
-            return resume_data
-        except json.JSONDecodeError as e:
-            # Clean up the JSON if necessary
-            print(f"Error parsing generated JSON: {e}, attempting to clean")
-            clean_json = resume_content.replace('```json', '').replace('```', '').strip()
-            try:
-                resume_data = json.loads(clean_json)
-                return resume_data
-            except json.JSONDecodeError:
-                # If still failing, create minimal valid JSON
-                print("Error parsing cleaned JSON, using minimal data")
-                # Extract name from resume if available
-                name = "Candidate"
-                if old_resume_text:
-                    for line in old_resume_text.split('\n'):
-                        if line.strip() and len(line.strip()) < 50:  # Simple heuristic to find a name
-                            name = line.strip()
-                            break
-                
-                return {
-                    "name": name,
-                    "designation": "Professional",
-                    "objective": "Experienced professional seeking new opportunities.",
-                    "education": ["Education details not extracted"],
-                    "skills": ["Skills not extracted"],
-                    "project_details": {
-                        "project1": {
-                            "name": "Project",
-                            "role": "Team Member",
-                            "description": "Project description not extracted",
-                            "technology": "Technologies not extracted",
-                            "role_played": "Role details not extracted"
-                        }
-                    }
-                }
+        selected = _select_resume_call(formatted_json_schema, old_resume_text, old_cover_letter_text, skill_matrix_json)
+        if selected is None:
+            return _minimal_resume_data("Candidate", "provided")
+        
+        call_name, args = selected
+        resume_content = getattr(llm_service, call_name)(*args)
+        print(f"Resume content after {call_name}",resume_content)
+        return _parse_resume_content(resume_content, old_resume_text)
     except Exception as e:
         print(f"Error in processing resume data: {str(e)}")
         # Create minimal valid JSON if processing fails
-        name = "Candidate"
-        if old_resume_text:
-            for line in old_resume_text.split('\n'):
-                if line.strip() and len(line.strip()) < 50:
-                    name = line.strip()
-                    break
-                
-        return {
-            "name": name,
-            "designation": "Professional",
-            "objective": "Experienced professional seeking new opportunities.",
-            "education": ["Education details not extracted"],
-            "skills": ["Skills not extracted"],
-            "project_details": {
-                "project1": {
-                    "name": "Project",
-                    "role": "Team Member",
-                    "description": "Project description not extracted",
-                    "technology": "Technologies not extracted",
-                    "role_played": "Role details not extracted"
-                }
-            }
-        }
\ No newline at end of file
+        return _minimal_resume_data(_guess_name(old_resume_text))
+
+async def process_resume_data_async(
+    formatted_json_schema: Dict,
+    old_resume_text: Optional[str] = None,
+    old_cover_letter_text: Optional[str] = None,
+    skill_matrix_json: Optional[str] = None
+) -> Dict:
+    """Async variant of process_resume_data"""
+    try:
+        selected = _select_resume_call(formatted_json_schema, old_resume_text, old_cover_letter_text, skill_matrix_json)
+        if selected is None:
+            return _minimal_resume_data("Candidate", "provided")
+        
+        call_name, args = selected
+        resume_content = await getattr(llm_service, f"{call_name}_async")(*args)
+        print(f"Resume content after {call_name}",resume_content)
+        return _parse_resume_content(resume_content, old_resume_text)
+    except Exception as e:
+        print(f"Error in processing resume data: {str(e)}")
+        # Create minimal valid JSON if processing fails
+        return _minimal_resume_data(_guess_name(old_resume_text))
@@ -0,0 +1,126 @@
+"""
+Registry of loaded skill matrices.
+
+Every uploaded workbook becomes a dataset identified by the SHA-256 of its
+content. A dataset is an immutable, indexed snapshot, so concurrent uploads
+never overwrite each other's data. Callers always name the dataset they want
+(by ID, or by the stored skill matrix file); there is no "latest upload".
+Only the most recently used datasets are kept in memory. Each snapshot is
+also pickled to CACHE_DIR/datasets, so an evicted dataset, or one uploaded
+through another worker, is reloaded from there on first access.
+"""
+
+import logging
+import os
+import pickle
+import re
+import time
+from typing import List, Optional
+
+import config
+from utils import excel_utils
+from utils.cache_utils import DiskStore, LRUCache
+
+logger = logging.getLogger(__name__)
+
+class DatasetNotFoundError(Exception):
+    """Raised when a dataset ID is unknown or no dataset was given"""
+
+class Dataset:
+    """Immutable snapshot of one skill matrix with its lookup indexes"""
+
+    def __init__(self, dataset_id: str, sheets_data: List[dict], filename: Optional[str] = None):
+        self.dataset_id = dataset_id
+        self.filename = filename
+        self.loaded_at = time.time()
+        self.index = excel_utils.SkillMatrixIndex(sheets_data)
+
+    @property
+    def sheets_data(self):
+        return self.index.sheets_data
+
+    @property
+    def total_records(self) -> int:
+        return sum(len(sheet["Data"]) for sheet in self.sheets_data)
+
+    def find_by_name(self, first_name: str, last_name: str) -> List[dict]:
+        return self.index.find_by_name(first_name, last_name)
+
+    def find_by_id(self, employee_id: int) -> List[dict]:
+        return self.index.find_by_id(employee_id)
+
+_DATASET_ID_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+_datasets = LRUCache(config.MAX_LOADED_DATASETS)
+_snapshots: Optional[DiskStore] = None
+
+def _snapshot_store() -> DiskStore:
+    global _snapshots
+    directory = os.path.join(config.CACHE_DIR, "datasets")
+    if _snapshots is None or _snapshots.directory != directory:
+        _snapshots = DiskStore(directory, ".pkl")
+    return _snapshots
+
+def _load_snapshot(dataset_id: str) -> Optional[Dataset]:
+    data = _snapshot_store().get(dataset_id)
+    if data is None:
+        return None
+    try:
+        snapshot = pickle.loads(data)
+        return Dataset(dataset_id, snapshot["sheets_data"], snapshot.get("filename"))
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable dataset snapshot {dataset_id[:12]}: {str(e)}")
+        return None
+
+def _register(dataset_id: str, sheets_data: List[dict], filename: Optional[str] = None) -> Dataset:
+    dataset = Dataset(dataset_id, sheets_data, filename)
+    _datasets.put(dataset_id, dataset)
+    store = _snapshot_store()
+    if not os.path.exists(store.path_for(dataset_id)):
+        snapshot = {"filename": filename, "sheets_data": [dict(sheet, Data=list(sheet["Data"])) for sheet in dataset.sheets_data]}
+        store.put(dataset_id, pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+    logger.info(f"Registered skill matrix dataset {dataset_id[:12]} ({dataset.total_records} records)")
+    return dataset
+
+def load_file(file_path: str, filename: Optional[str] = None, digest: Optional[str] = None) -> Dataset:
+    """Load a skill matrix file into the registry (reusing it if already loaded)"""
+    if digest is not None:
+        dataset = get(digest)
+        if dataset is not None:
+            return dataset
+    dataset_id, sheets_data = excel_utils.read_skill_matrix(file_path, digest)
+    dataset = get(dataset_id)
+    if dataset is not None:
+        return dataset
+    return _register(dataset_id, sheets_data, filename)
+
+def get(dataset_id: str) -> Optional[Dataset]:
+    """Return a dataset by ID, reloading its snapshot from disk if it is not in memory"""
+    dataset = _datasets.get(dataset_id)
+    if dataset is not None:
+        return dataset
+    
+    # IDs are SHA-256 hex digests; anything else never reaches the cache directory
+    if not _DATASET_ID_PATTERN.fullmatch(dataset_id):
+        return None
+    
+    dataset = _load_snapshot(dataset_id)
+    if dataset is not None:
+        _datasets.put(dataset_id, dataset)
+    return dataset
+
+def resolve(dataset_id: Optional[str] = None, file_path: Optional[str] = None) -> Dataset:
+    """
+    Find the dataset for a request: an explicit dataset ID wins, then a skill
+    matrix file path. One of them is required.
+    """
+    if dataset_id:
+        dataset = get(dataset_id)
+        if dataset is None:
+            raise DatasetNotFoundError(f"Skill matrix dataset {dataset_id} not found. Please upload the skill matrix again.")
+        return dataset
+    
+    if file_path:
+        return load_file(file_path)
+    
+    raise DatasetNotFoundError("No skill matrix selected. Upload a skill matrix and pass the dataset_id it returns.")
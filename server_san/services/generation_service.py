@@ -0,0 +1,255 @@
+"""
+Resume generation pipeline shared by the synchronous /generate/resume route
+and the background job workers.
+"""
+
+import asyncio
+import json
+import os
+import traceback
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+import config
+from models.schema import ResumeRequest
+from services import llm_service, data_service, schema_cache, dataset_registry, storage_service, text_cache
+from utils import output_allocator, render_engine
+from utils.pdf_output import finalize, pdf_bytes
+
+# Pipeline stages reported to the progress callback, in order
+STAGES = [
+    "template_schema",
+    "extracting_inputs",
+    "generating_resume_data",
+    "rendering_resume",
+    "generating_cover_letter",
+]
+
+ProgressCallback = Callable[[str], None]
+
+def _report(progress: Optional[ProgressCallback], stage: str):
+    if progress is not None:
+        progress(stage)
+
+def _candidate_name(resume_data) -> str:
+    return resume_data.get("name", "Candidate") if isinstance(resume_data, dict) else "Candidate"
+
+def _error_resume_pdf(resume_data, error: Exception):
+    """Simple PDF with basic information, used when the resume template fails"""
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+    
+    # Get name or fallback
+    pdf.cell(0, 10, _candidate_name(resume_data), ln=True, align="L")
+    
+    pdf.set_font("Arial", "", 11)
+    pdf.multi_cell(0, 7, "An error occurred while generating the complete resume.")
+    pdf.ln(10)
+    pdf.multi_cell(0, 7, f"Error details: {str(error)}")
+    pdf.ln(10)
+    pdf.multi_cell(0, 7, "Please try again or contact support if the issue persists.")
+    return pdf
+
+def _write_error_resume(resume_data, error: Exception) -> str:
+    resume_path = os.path.join(config.OUTPUT_DIR, f"Error_Resume.pdf")
+    return finalize(_error_resume_pdf(resume_data, error), resume_path)
+
+async def render_resume_pdf(resume_data, template_id: int) -> str:
+    """Step 3: render the resume PDF, writing a simple error PDF if the template fails"""
+    try:
+        resume_path = await render_engine.render_resume(template_id, resume_data)
+        
+        # Verify the file was created
+        if not os.path.exists(resume_path):
+            raise Exception("The resume PDF file was not created.")
+        return resume_path
+    except Exception as e:
+        print(f"Error generating PDF: {str(e)}")
+        print(traceback.format_exc())
+        
+        return await run_in_threadpool(_write_error_resume, resume_data, e)
+
+async def render_resume_bytes(resume_data, template_id: int, fallback: bool = True) -> Tuple[str, bytes]:
+    """Step 3 without touching the disk: returns (filename, PDF bytes).
+    With fallback=False a template failure is raised instead of returning an error PDF"""
+    try:
+        return await render_engine.render_resume(template_id, resume_data, in_memory=True, strict=not fallback)
+    except Exception as e:
+        if not fallback:
+            raise
+        print(f"Error generating PDF: {str(e)}")
+        print(traceback.format_exc())
+        error_pdf = await run_in_threadpool(lambda: pdf_bytes(_error_resume_pdf(resume_data, e)))
+        return "Error_Resume.pdf", error_pdf
+
+async def _render_cover_letter(resume_data, cover_letter_text: str, template_id: int) -> str:
+    """Render the cover letter PDF from the generated text"""
+    if not cover_letter_text or len(cover_letter_text.strip()) < 10:
+        raise Exception("Generated cover letter text is too short or empty")
+        
+    cover_letter_path = await render_engine.render_cover_letter(template_id, resume_data, cover_letter_text)
+    
+    # Verify the file was created
+    if not cover_letter_path or not os.path.exists(cover_letter_path):
+        raise Exception("The cover letter PDF file was not created.")
+    return cover_letter_path
+
+def store_output(output_path: str) -> str:
+    """Move a rendered PDF into content-addressed storage and return its stored path"""
+    stored = storage_service.put_file(output_path)
+    output_allocator.release(output_path)
+    return stored.path
+
+def _render_cover_letter_error(resume_data, error_detail: str) -> Optional[str]:
+    """Write a simple error cover letter PDF"""
+    try:
+        from fpdf import FPDF
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_font("Arial", "B", 16)
+        pdf.cell(0, 10, f"{_candidate_name(resume_data)} - Cover Letter Error", ln=True, align="L")
+        pdf.set_font("Arial", "", 11)
+        pdf.multi_cell(0, 7, "An error occurred while generating the cover letter.")
+        pdf.ln(5)
+        pdf.multi_cell(0, 7, f"Error details: {error_detail}")
+        
+        cover_letter_path = os.path.join(config.OUTPUT_DIR, f"Error_Cover_Letter.pdf")
+        return store_output(finalize(pdf, cover_letter_path))
+    except:
+        # If this fails too, just log it
+        print("Failed to generate error cover letter PDF")
+        return None
+
+async def _finish_cover_letter(cover_letter_task: asyncio.Task, resume_data, template_id: int) -> Tuple[str, Optional[str]]:
+    """Step 4: await the cover letter text and render it, returning (status message, stored path)"""
+    try:
+        cover_letter_text = await cover_letter_task
+        cover_letter_path = await _render_cover_letter(resume_data, cover_letter_text, template_id)
+        cover_letter_path = await run_in_threadpool(store_output, cover_letter_path)
+        return "Generated successfully", cover_letter_path
+    except Exception as e:
+        error_detail = str(e)
+        print(f"Error generating cover letter: {error_detail}")
+        print(traceback.format_exc())
+        
+        # Try to create a simple error cover letter
+        cover_letter_path = await run_in_threadpool(_render_cover_letter_error, resume_data, error_detail)
+        return f"Failed to generate: {error_detail}", cover_letter_path
+
+def _pinned_inputs(request: ResumeRequest):
+    """Keep the request's stored inputs from being evicted while it runs"""
+    return storage_service.pinned(
+        request.template_path,
+        request.old_resume_path,
+        request.old_cover_letter_path,
+        request.skill_matrix_path
+    )
+
+async def _build_resume_data(request: ResumeRequest, progress: Optional[ProgressCallback] = None):
+    """Steps 1-2: template schema, input extraction and the resume data LLM call"""
+    # Validate that template exists
+    if not os.path.exists(request.template_path):
+        raise FileNotFoundError("Template file not found. Please upload a template first.")
+    
+    # Step 1: Extract structured JSON from template (cached by template content)
+    _report(progress, "template_schema")
+    formatted_json_schema = await schema_cache.get_template_schema(request.template_path)
+    print("formatted_json_schema",formatted_json_schema)
+    
+    # Get input files content if available
+    _report(progress, "extracting_inputs")
+    old_resume_text = None
+    old_cover_letter_text = None
+    skill_matrix_json = None
+    
+    if request.old_resume_path and os.path.exists(request.old_resume_path):
+        old_resume_text = await text_cache.get_text_async(request.old_resume_path)
+        
+    
+    if request.old_cover_letter_path and os.path.exists(request.old_cover_letter_path):
+        old_cover_letter_text = await text_cache.get_text_async(request.old_cover_letter_path)
+    
+    has_skill_matrix_file = bool(request.skill_matrix_path and os.path.exists(request.skill_matrix_path))
+    if request.dataset_id or has_skill_matrix_file:
+        # If first name and last name are provided, get specific data
+        if request.first_name and request.last_name:
+            dataset = await run_in_threadpool(
+                dataset_registry.resolve,
+                request.dataset_id,
+                request.skill_matrix_path if has_skill_matrix_file else None
+            )
+            skill_matrix_data = dataset.find_by_name(request.first_name, request.last_name)
+            if skill_matrix_data:
+                skill_matrix_json = json.dumps(skill_matrix_data)
+        elif has_skill_matrix_file:
+            # Use the whole file content with explicit UTF-8 encoding
+            with open(request.skill_matrix_path, 'r', encoding='utf-8', errors='replace') as f:
+                skill_matrix_json = f.read()
+    print("old_resume_text",old_resume_text)
+    print("old_cover_letter_text",old_cover_letter_text)
+    print("skill_matrix_json",skill_matrix_json)
+
+    # Step 2: Process the resume data
+    _report(progress, "generating_resume_data")
+    resume_data = await data_service.process_resume_data_async(
+        formatted_json_schema,
+        old_resume_text,
+        old_cover_letter_text,
+        skill_matrix_json
+    )
+    return resume_data
+
+async def run_generation(request: ResumeRequest, progress: Optional[ProgressCallback] = None) -> Dict:
+    """
+    Run the full generation pipeline for one request.
+    
+    Args:
+        request: The resume generation request
+        progress: Optional callback invoked with the name of each stage as it starts
+        
+    Returns:
+        Dictionary with the stored resume and cover letter paths and cover letter status
+    """
+    # Stored inputs are only read while building the resume data
+    with _pinned_inputs(request):
+        resume_data = await _build_resume_data(request, progress)
+    
+    # Log the template_id coming from the frontend
+    print(f"Received template_id: {request.template_id}")
+    
+    # Get the selected template ID (default to 1 if not specified)
+    template_id = request.template_id if request.template_id is not None else 1
+        
+    # Step 4 only needs resume_data, so start the cover letter LLM call now and
+    # let it run while the resume PDF is rendered in a render worker (Step 3)
+    _report(progress, "rendering_resume")
+    cover_letter_task = asyncio.create_task(
+        llm_service.generate_cover_letter_from_resume_async(resume_data)
+    )
+    try:
+        resume_path = await render_resume_pdf(resume_data, template_id)
+        resume_path = await run_in_threadpool(store_output, resume_path)
+    except BaseException:
+        cover_letter_task.cancel()
+        raise
+    
+    _report(progress, "generating_cover_letter")
+    cover_letter_status, cover_letter_path = await _finish_cover_letter(cover_letter_task, resume_data, template_id)
+    
+    return {
+        "message": "Resume generated successfully",
+        "resume_path": resume_path,
+        "cover_letter_path": cover_letter_path,
+        "cover_letter_status": cover_letter_status,
+        "template_used": template_id  # Return the template ID used
+    }
+
+async def run_generation_pdf(request: ResumeRequest) -> Tuple[str, bytes]:
+    """Generate only the resume and render it in memory; returns (filename, PDF bytes)"""
+    with _pinned_inputs(request):
+        resume_data = await _build_resume_data(request)
+    template_id = request.template_id if request.template_id is not None else 1
+    return await render_resume_bytes(resume_data, template_id)
@@ -0,0 +1,315 @@
+"""
+Background generation jobs.
+
+A job is created by POST /generate/jobs and executed by a bounded pool of
+asyncio workers running generation_service.run_generation. Job state is
+persisted to a SQLite database shared by every worker process. Each job is
+owned by one process, which renews a lease on it every JOB_HEARTBEAT_SECONDS;
+jobs whose lease has lapsed (their process died or stopped) are reclaimed
+and re-queued by another process, while jobs a live sibling is running are
+left alone. Progress is published to in-process subscribers for the
+Server-Sent Events stream.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from typing import Dict, List, Optional, Set
+
+import config
+from models.schema import ResumeRequest
+from services import generation_service, storage_service
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+FINAL_STATUSES = (STATUS_COMPLETED, STATUS_FAILED)
+
+class JobQueueFullError(Exception):
+    """Raised when the queue already holds GENERATION_QUEUE_SIZE pending jobs"""
+
+class JobStore:
+    """SQLite-backed persistence for generation jobs"""
+
+    def __init__(self, db_path: str):
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    request TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT,
+                    lease_expires REAL
+                )
+                """
+            )
+            # Databases created before leases existed
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            if "lease_expires" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN lease_expires REAL")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    def create(self, job_id: str, request: Dict, owner: str):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO jobs (id, status, stage, request, created_at, updated_at, owner, lease_expires)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (job_id, STATUS_QUEUED, STATUS_QUEUED, json.dumps(request), now, now, owner, now + config.JOB_LEASE_SECONDS),
+            )
+
+    def update(self, job_id: str, **fields):
+        if "result" in fields and fields["result"] is not None:
+            fields["result"] = json.dumps(fields["result"])
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def claim_expired(self, owner: str) -> List[Dict]:
+        """Take over unfinished jobs whose lease has lapsed (or that never had one), oldest first"""
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                """
+                SELECT * FROM jobs WHERE status IN (?, ?) AND (lease_expires IS NULL OR lease_expires < ?)
+                ORDER BY created_at
+                """,
+                (STATUS_QUEUED, STATUS_RUNNING, now),
+            ).fetchall()
+            claimed = []
+            for row in rows:
+                # Re-check the lease in the UPDATE so two processes never claim the same job
+                updated = self._conn.execute(
+                    """
+                    UPDATE jobs SET owner = ?, lease_expires = ?, status = ?, stage = ?, updated_at = ?
+                    WHERE id = ? AND status IN (?, ?) AND (lease_expires IS NULL OR lease_expires < ?)
+                    """,
+                    (owner, now + config.JOB_LEASE_SECONDS, STATUS_QUEUED, STATUS_QUEUED, now,
+                     row["id"], STATUS_QUEUED, STATUS_RUNNING, now),
+                ).rowcount
+                if updated:
+                    claimed.append(self._to_dict(row))
+        return claimed
+
+    def renew_leases(self, owner: str):
+        """Extend the lease on every unfinished job this process owns"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE owner = ? AND status IN (?, ?)",
+                (now + config.JOB_LEASE_SECONDS, owner, STATUS_QUEUED, STATUS_RUNNING),
+            )
+
+    def release_leases(self, owner: str):
+        """Let other processes reclaim this process's unfinished jobs right away"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET lease_expires = 0 WHERE owner = ? AND status IN (?, ?)",
+                (owner, STATUS_QUEUED, STATUS_RUNNING),
+            )
+
+    def owned_by(self, job_id: str, owner: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT owner FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row is not None and row["owner"] == owner
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job["request"] = json.loads(job["request"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+_store: Optional[JobStore] = None
+_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+_heartbeat: Optional[asyncio.Task] = None
+# Identifies this process as the owner of the jobs it runs
+_owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+_subscribers: Dict[str, Set[asyncio.Queue]] = {}
+# Storage pins held for each queued or running job
+_pins: Dict[str, List[str]] = {}
+
+def _get_store() -> JobStore:
+    global _store
+    if _store is None:
+        _store = JobStore(config.JOBS_DB_PATH)
+    return _store
+
+def public_view(job: Dict) -> Dict:
+    """Job fields returned by the API"""
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "result": job["result"],
+        "resume_path": job["result"].get("resume_path") if job["result"] else None,
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
+
+def _publish(job_id: str):
+    """Push the current job state to every SSE subscriber of this job"""
+    subscribers = _subscribers.get(job_id)
+    if not subscribers:
+        return
+    job = _get_store().get(job_id)
+    if job is None:
+        return
+    event = public_view(job)
+    for subscriber in list(subscribers):
+        subscriber.put_nowait(event)
+
+def _input_paths(request: Dict) -> List[Optional[str]]:
+    return [request.get(field) for field in ("template_path", "old_resume_path", "old_cover_letter_path", "skill_matrix_path")]
+
+def _pin_inputs(job_id: str, request: Dict):
+    """Keep the job's uploaded inputs from being evicted until it finishes"""
+    _pins[job_id] = storage_service.pin(_input_paths(request))
+
+def _unpin_inputs(job_id: str):
+    storage_service.unpin(_pins.pop(job_id, []))
+
+def _set_stage(job_id: str, stage: str):
+    _get_store().update(job_id, stage=stage)
+    _publish(job_id)
+
+async def _run_job(job_id: str):
+    store = _get_store()
+    job = store.get(job_id)
+    if job is None or job["status"] in FINAL_STATUSES or not store.owned_by(job_id, _owner):
+        # Finished, or reclaimed by another process after our lease lapsed
+        _unpin_inputs(job_id)
+        return
+
+    store.update(job_id, status=STATUS_RUNNING)
+    _publish(job_id)
+    try:
+        request = ResumeRequest(**job["request"])
+        result = await generation_service.run_generation(request, progress=lambda stage: _set_stage(job_id, stage))
+        store.update(job_id, status=STATUS_COMPLETED, stage=STATUS_COMPLETED, result=result)
+    except Exception as e:
+        logger.error(f"Generation job {job_id} failed: {str(e)}")
+        logger.error(traceback.format_exc())
+        store.update(job_id, status=STATUS_FAILED, error=str(e))
+    finally:
+        _unpin_inputs(job_id)
+    _publish(job_id)
+
+async def _worker(worker_id: int):
+    while True:
+        job_id = await _queue.get()
+        try:
+            await _run_job(job_id)
+        except Exception as e:
+            # Never let one job take the worker down
+            logger.error(f"Generation worker {worker_id} error on job {job_id}: {str(e)}")
+        finally:
+            _queue.task_done()
+
+def _reclaim():
+    """Queue the unfinished jobs whose owner stopped renewing its lease"""
+    recovered = _get_store().claim_expired(_owner)
+    for job in recovered:
+        _pin_inputs(job["id"], job["request"])
+        _queue.put_nowait(job["id"])
+    if recovered:
+        logger.info(f"Re-queued {len(recovered)} unfinished generation jobs")
+
+async def _renew():
+    while True:
+        await asyncio.sleep(config.JOB_HEARTBEAT_SECONDS)
+        try:
+            _get_store().renew_leases(_owner)
+            _reclaim()
+        except Exception as e:
+            logger.error(f"Generation job heartbeat failed: {str(e)}")
+
+async def start():
+    """Start the worker pool and re-queue unfinished jobs no live process holds a lease on"""
+    global _queue, _heartbeat
+    if _workers:
+        return
+    _queue = asyncio.Queue()
+
+    _reclaim()
+    for worker_id in range(config.GENERATION_WORKERS):
+        _workers.append(asyncio.create_task(_worker(worker_id)))
+    _heartbeat = asyncio.create_task(_renew())
+    logger.info(f"Started {config.GENERATION_WORKERS} generation workers")
+
+async def stop():
+    """Stop the workers; unfinished jobs stay persisted and are released for another process"""
+    global _heartbeat
+    tasks = list(_workers) + ([_heartbeat] if _heartbeat is not None else [])
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _workers.clear()
+    _heartbeat = None
+    _get_store().release_leases(_owner)
+
+def submit(request: ResumeRequest) -> Dict:
+    """Persist a new job and queue it for the worker pool"""
+    if _queue is None:
+        raise RuntimeError("Generation workers are not running")
+    if _queue.qsize() >= config.GENERATION_QUEUE_SIZE:
+        raise JobQueueFullError("Generation queue is full, please retry later")
+
+    job_id = uuid.uuid4().hex
+    _get_store().create(job_id, request.dict(), _owner)
+    _pin_inputs(job_id, request.dict())
+    _queue.put_nowait(job_id)
+    return get_job(job_id)
+
+def get_job(job_id: str) -> Optional[Dict]:
+    """Return the public view of a job, or None if it does not exist"""
+    job = _get_store().get(job_id)
+    return public_view(job) if job else None
+
+def subscribe(job_id: str) -> asyncio.Queue:
+    """Register a queue that receives the job state after every change"""
+    subscriber: asyncio.Queue = asyncio.Queue()
+    _subscribers.setdefault(job_id, set()).add(subscriber)
+    return subscriber
+
+def unsubscribe(job_id: str, subscriber: asyncio.Queue):
+    subscribers = _subscribers.get(job_id)
+    if subscribers is not None:
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del _subscribers[job_id]
@@ -0,0 +1,83 @@
+"""
+Process-wide Mistral client backed by shared keep-alive connection pools.
+
+The client is created once on application startup and reused by every
+LLM call, so repeated generations do not pay for new TCP/TLS handshakes.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+import httpx
+from mistralai import Mistral
+
+import config
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[Mistral] = None
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+_lock = threading.Lock()
+
+def _pool_limits() -> httpx.Limits:
+    """Connection pool limits shared by the sync and async transports"""
+    return httpx.Limits(
+        max_connections=config.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY,
+    )
+
+def _timeouts() -> httpx.Timeout:
+    """Request timeouts for calls to the Mistral API"""
+    return httpx.Timeout(config.LLM_READ_TIMEOUT, connect=config.LLM_CONNECT_TIMEOUT)
+
+def init_client() -> Mistral:
+    """Create the shared Mistral client and its connection pools (idempotent)"""
+    global _client, _http_client, _async_http_client
+    with _lock:
+        if _client is None:
+            _http_client = httpx.Client(limits=_pool_limits(), timeout=_timeouts())
+            _async_http_client = httpx.AsyncClient(limits=_pool_limits(), timeout=_timeouts())
+            _client = Mistral(
+                api_key=config.API_KEY,
+                client=_http_client,
+                async_client=_async_http_client,
+                timeout_ms=int(config.LLM_READ_TIMEOUT * 1000),
+            )
+            logger.info(
+                f"Initialized Mistral client (max_connections={config.LLM_MAX_CONNECTIONS}, "
+                f"keepalive={config.LLM_MAX_KEEPALIVE_CONNECTIONS})"
+            )
+    return _client
+
+def get_client() -> Mistral:
+    """Return the shared Mistral client, creating it lazily if startup has not run"""
+    if _client is None:
+        return init_client()
+    return _client
+
+async def close_client():
+    """Close the pooled connections held by the shared client"""
+    global _client, _http_client, _async_http_client
+    with _lock:
+        http_client, async_http_client = _http_client, _async_http_client
+        _client = None
+        _http_client = None
+        _async_http_client = None
+    if http_client is not None:
+        http_client.close()
+    if async_http_client is not None:
+        await async_http_client.aclose()
+    logger.info("Closed Mistral client connection pools")
+
+def chat_complete(**request) -> str:
+    """Run a blocking chat completion and return the first message content"""
+    chat_response = get_client().chat.complete(**request)
+    return chat_response.choices[0].message.content
+
+async def chat_complete_async(**request) -> str:
+    """Run a chat completion on the async transport and return the first message content"""
+    chat_response = await get_client().chat.complete_async(**request)
+    return chat_response.choices[0].message.content
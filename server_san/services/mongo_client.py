@@ -0,0 +1,66 @@
+"""
+Process-wide async MongoDB client.
+
+Auth lookups used to go through three separate blocking PyMongo clients
+created at import time. All MongoDB access now goes through one Motor
+client with a single configurable connection pool, opened on application
+startup and closed on shutdown.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
+
+import config
+
+logger = logging.getLogger(__name__)
+
+BLACKLIST_COLLECTION = "token_blacklist"
+PASSWORD_RESET_COLLECTION = "password_reset_tokens"
+
+_client: Optional[AsyncIOMotorClient] = None
+_lock = threading.Lock()
+
+def init_client() -> AsyncIOMotorClient:
+    """Create the shared Motor client and its connection pool (idempotent)"""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = AsyncIOMotorClient(
+                config.MONGODB_URL,
+                minPoolSize=config.MONGODB_MIN_POOL_SIZE,
+                maxPoolSize=config.MONGODB_MAX_POOL_SIZE,
+                connectTimeoutMS=config.MONGODB_CONNECT_TIMEOUT_MS,
+                serverSelectionTimeoutMS=config.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+                socketTimeoutMS=config.MONGODB_SOCKET_TIMEOUT_MS,
+                waitQueueTimeoutMS=config.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+            )
+            logger.info(
+                f"Initialized MongoDB client (min_pool={config.MONGODB_MIN_POOL_SIZE}, "
+                f"max_pool={config.MONGODB_MAX_POOL_SIZE})"
+            )
+    return _client
+
+def get_db() -> AsyncIOMotorDatabase:
+    """Return the application database, creating the client lazily if startup has not run"""
+    client = _client if _client is not None else init_client()
+    return client[config.DATABASE_NAME]
+
+def users() -> AsyncIOMotorCollection:
+    return get_db()[config.USER_COLLECTION]
+
+def blacklist() -> AsyncIOMotorCollection:
+    return get_db()[BLACKLIST_COLLECTION]
+
+def password_resets() -> AsyncIOMotorCollection:
+    return get_db()[PASSWORD_RESET_COLLECTION]
+
+def close_client():
+    """Close the pooled connections held by the shared client"""
+    global _client
+    with _lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
@@ -0,0 +1,99 @@
+"""
+MongoDB index bootstrap.
+
+Every auth query relies on one of the indexes below. They are ensured once
+on startup; index creation is idempotent, so existing indexes are left
+alone. Conflicts (an existing index with the same name or keys but other
+options, or duplicate values blocking a unique index) abort startup
+instead of leaving the query silently unindexed. TTL indexes let expired
+reset tokens and revoked tokens remove themselves.
+"""
+
+import logging
+from typing import Dict, List
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure, PyMongoError
+
+from services import mongo_client
+
+logger = logging.getLogger(__name__)
+
+# IndexOptionsConflict, IndexKeySpecsConflict, DuplicateKey
+CONFLICT_ERROR_CODES = (85, 86, 11000)
+
+class IndexConflictError(RuntimeError):
+    """Raised when a required index cannot be built because of conflicting data or definitions"""
+
+def _index_specs():
+    return {
+        mongo_client.users: [
+            IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+            IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        ],
+        mongo_client.password_resets: [
+            IndexModel([("token", ASCENDING)], name="token_unique", unique=True),
+            IndexModel([("user_id", ASCENDING)], name="user_id"),
+            IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+        ],
+        mongo_client.blacklist: [
+            IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+            IndexModel([("jti", ASCENDING)], name="jti", sparse=True),
+            IndexModel([("revoked_at", ASCENDING)], name="revoked_at"),
+            # Tokens revoked before jti existed are still looked up by the full token
+            IndexModel([("token", ASCENDING)], name="token", sparse=True),
+        ],
+    }
+
+# Result of the last ensure_indexes run, one entry per index
+_status: List[Dict] = []
+
+async def ensure_indexes() -> List[Dict]:
+    """Create any missing indexes and return the build status of each one"""
+    results = []
+    unreachable = False
+    for get_collection, indexes in _index_specs().items():
+        collection = get_collection()
+        existing = set()
+        if not unreachable:
+            try:
+                existing = {index["name"] async for index in collection.list_indexes()}
+            except PyMongoError as e:
+                logger.error(f"Could not list indexes on {collection.name}: {str(e)}")
+                unreachable = True
+
+        for index in indexes:
+            name = index.document["name"]
+            entry = {"collection": collection.name, "index": name}
+            if unreachable:
+                # Don't wait out the server selection timeout once per index
+                entry["status"] = "skipped"
+                results.append(entry)
+                continue
+            try:
+                await collection.create_indexes([index])
+                entry["status"] = "exists" if name in existing else "created"
+                logger.info(f"Index {collection.name}.{name}: {entry['status']}")
+            except OperationFailure as e:
+                if e.code in CONFLICT_ERROR_CODES:
+                    message = f"Index {collection.name}.{name} conflicts with the database (code {e.code}): {str(e)}"
+                    logger.error(message)
+                    entry.update(status="conflict", error=str(e))
+                    results.append(entry)
+                    _status[:] = results
+                    raise IndexConflictError(message) from e
+                logger.error(f"Index {collection.name}.{name} failed: {str(e)}")
+                entry.update(status="failed", error=str(e))
+            except PyMongoError as e:
+                # MongoDB unreachable: start anyway, as before; queries still work unindexed
+                logger.error(f"Index {collection.name}.{name} failed: {str(e)}")
+                entry.update(status="failed", error=str(e))
+                unreachable = True
+            results.append(entry)
+
+    _status[:] = results
+    return results
+
+def get_status() -> List[Dict]:
+    """Build status of each index from the last startup"""
+    return list(_status)
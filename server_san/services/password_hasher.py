@@ -0,0 +1,111 @@
+"""
+Bounded executor for bcrypt password hashing and verification.
+
+Each bcrypt operation costs roughly 250 ms of CPU, so running it inside an
+async handler stalls every other request on the worker. Hashing runs on a
+dedicated pool of PASSWORD_HASH_WORKERS threads instead, and at most
+PASSWORD_HASH_MAX_PENDING operations may be queued or running at once;
+beyond that callers get PasswordHasherBusyError right away (turned into a
+503 by the auth service) rather than piling up behind a login burst.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from passlib.context import CryptContext
+
+import config
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+class PasswordHasherBusyError(Exception):
+    """Raised when PASSWORD_HASH_MAX_PENDING operations are already in flight"""
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_metrics_lock = threading.Lock()
+_pending = 0
+_running = 0
+_completed = 0
+_failed = 0
+_rejected = 0
+_total_wait_ms = 0.0
+_total_run_ms = 0.0
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=config.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+            )
+        return _executor
+
+def _run(operation: Callable, args: tuple, submitted: float):
+    global _running, _total_wait_ms, _total_run_ms
+    started = time.perf_counter()
+    with _metrics_lock:
+        _running += 1
+        _total_wait_ms += (started - submitted) * 1000
+    try:
+        return operation(*args)
+    finally:
+        with _metrics_lock:
+            _running -= 1
+            _total_run_ms += (time.perf_counter() - started) * 1000
+
+async def _submit(operation: Callable, *args):
+    global _pending, _completed, _failed, _rejected
+    with _metrics_lock:
+        if _pending >= config.PASSWORD_HASH_MAX_PENDING:
+            _rejected += 1
+            raise PasswordHasherBusyError("Too many concurrent password operations, please retry shortly")
+        _pending += 1
+    succeeded = False
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(_get_executor(), _run, operation, args, time.perf_counter())
+        succeeded = True
+        return result
+    finally:
+        with _metrics_lock:
+            _pending -= 1
+            if succeeded:
+                _completed += 1
+            else:
+                _failed += 1
+
+async def hash_password(password: str) -> str:
+    """bcrypt-hash a password on the hashing pool"""
+    return await _submit(pwd_context.hash, password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its bcrypt hash on the hashing pool"""
+    return await _submit(pwd_context.verify, plain_password, hashed_password)
+
+def get_metrics() -> Dict:
+    with _metrics_lock:
+        # Wait/run totals cover every operation that reached the pool, failed ones included
+        finished = _completed + _failed
+        return {
+            "workers": config.PASSWORD_HASH_WORKERS,
+            "max_pending": config.PASSWORD_HASH_MAX_PENDING,
+            "pending": _pending,
+            "running": _running,
+            "queued": max(0, _pending - _running),
+            "completed": _completed,
+            "failed": _failed,
+            "rejected": _rejected,
+            "avg_wait_ms": round(_total_wait_ms / finished, 1) if finished else 0.0,
+            "avg_run_ms": round(_total_run_ms / finished, 1) if finished else 0.0,
+        }
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
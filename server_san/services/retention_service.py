@@ -0,0 +1,267 @@
+"""
+Retention and garbage collection for stored documents.
+
+A background task sweeps storage every RETENTION_SWEEP_INTERVAL_SECONDS:
+objects not accessed (uploaded, downloaded or used as a generation input)
+for RETENTION_TTL_HOURS are released, then the least recently accessed
+objects are released until the stored blobs fit in STORAGE_QUOTA_BYTES.
+Blobs pinned by running generations or queued jobs in any worker process
+are never evicted; pins are leases in the storage index, renewed every
+PIN_LEASE_SECONDS / 3 by each process while it is alive.
+The disk caches under CACHE_DIR (everything except in-flight uploads) are
+trimmed, least recently used first, until they fit in CACHE_QUOTA_BYTES.
+Renders left behind in the allocator's RENDER_DIR/<uuid>/ directories are
+removed by modification time using the same TTL; nothing else under
+OUTPUT_DIR is touched.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+import config
+from services import storage_service
+
+logger = logging.getLogger(__name__)
+
+# Directory names created by output_allocator.allocate
+_RENDER_DIR_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+# Cache subdirectories the quota never touches
+_CACHE_SKIP = {os.path.basename(config.UPLOAD_TMP_DIR)}
+
+_task: Optional[asyncio.Task] = None
+_renew_task: Optional[asyncio.Task] = None
+_metrics_lock = threading.Lock()
+_metrics = {
+    "sweeps": 0,
+    "last_sweep_at": None,
+    "last_sweep_seconds": None,
+    "objects_evicted": 0,
+    "output_files_removed": 0,
+    "cache_entries_removed": 0,
+    "bytes_reclaimed": 0,
+    "last_bytes_reclaimed": 0,
+    "skipped_pinned": 0,
+}
+
+def _sweep_files(cutoff: float, directory: str) -> Dict[str, int]:
+    """Remove files in a render directory last modified before the cutoff"""
+    removed = 0
+    reclaimed = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                if stat.st_mtime >= cutoff:
+                    continue
+                os.remove(entry.path)
+            except OSError:
+                continue
+            removed += 1
+            reclaimed += stat.st_size
+    return {"removed": removed, "reclaimed": reclaimed}
+
+def _sweep_render_dirs(cutoff: float) -> Dict[str, int]:
+    """Remove stale renders that never made it into storage, and their directories"""
+    removed = 0
+    reclaimed = 0
+    with os.scandir(config.RENDER_DIR) as entries:
+        for entry in entries:
+            if not entry.is_dir() or not _RENDER_DIR_PATTERN.fullmatch(entry.name):
+                continue
+            swept = _sweep_files(cutoff, entry.path)
+            removed += swept["removed"]
+            reclaimed += swept["reclaimed"]
+            try:
+                os.rmdir(entry.path)
+            except OSError:
+                # Still holds a recent render
+                pass
+    return {"removed": removed, "reclaimed": reclaimed}
+
+def _tree_size(path: str) -> int:
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return size
+
+def _cache_entries() -> List[Tuple[float, int, str]]:
+    """(mtime, size, path) for each evictable cache entry: a file, or a directory such as a cached workbook"""
+    entries = []
+    with os.scandir(config.CACHE_DIR) as tiers:
+        for tier in tiers:
+            if not tier.is_dir() or tier.name in _CACHE_SKIP:
+                continue
+            with os.scandir(tier.path) as items:
+                for item in items:
+                    if item.name.startswith(".tmp-"):
+                        # Still being written
+                        continue
+                    try:
+                        size = _tree_size(item.path) if item.is_dir() else item.stat().st_size
+                        entries.append((item.stat().st_mtime, size, item.path))
+                    except OSError:
+                        continue
+    return entries
+
+def _sweep_cache() -> Dict[str, int]:
+    """Evict the least recently used disk cache entries until the caches fit in CACHE_QUOTA_BYTES"""
+    entries = _cache_entries()
+    cached_bytes = sum(size for _, size, _ in entries)
+    removed = 0
+    reclaimed = 0
+    for _, size, path in sorted(entries):
+        if cached_bytes <= config.CACHE_QUOTA_BYTES:
+            break
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            continue
+        removed += 1
+        reclaimed += size
+        cached_bytes -= size
+    return {"removed": removed, "reclaimed": reclaimed, "cached_bytes": cached_bytes}
+
+def sweep() -> Dict:
+    """Run one retention pass and return what it reclaimed"""
+    started = time.time()
+    evicted = 0
+    reclaimed = 0
+    skipped = 0
+    
+    objects = storage_service.get_index().objects()
+    # Least recently accessed first
+    objects.sort(key=lambda obj: obj["last_access"])
+    blob_sizes = {obj["digest"]: obj["size"] for obj in objects}
+    references = {}
+    for obj in objects:
+        references[obj["digest"]] = references.get(obj["digest"], 0) + 1
+    stored_bytes = sum(blob_sizes.values())
+    
+    ttl_seconds = config.RETENTION_TTL_HOURS * 3600
+    cutoff = started - ttl_seconds if ttl_seconds > 0 else None
+    
+    for obj in objects:
+        expired = cutoff is not None and obj["last_access"] < cutoff
+        over_quota = config.STORAGE_QUOTA_BYTES > 0 and stored_bytes > config.STORAGE_QUOTA_BYTES
+        if not expired and not over_quota:
+            # Sorted by access time, so nothing later is expired either
+            break
+        
+        freed = storage_service.release_unless_pinned(obj["name"], obj["digest"])
+        if freed is None:
+            skipped += 1
+            continue
+        evicted += 1
+        references[obj["digest"]] -= 1
+        if references[obj["digest"]] == 0:
+            stored_bytes -= blob_sizes[obj["digest"]]
+        reclaimed += freed
+    
+    output_files = {"removed": 0, "reclaimed": 0}
+    if cutoff is not None:
+        output_files = _sweep_render_dirs(cutoff)
+        reclaimed += output_files["reclaimed"]
+    
+    cache = {"removed": 0, "reclaimed": 0}
+    if config.CACHE_QUOTA_BYTES > 0:
+        cache = _sweep_cache()
+        reclaimed += cache["reclaimed"]
+    
+    duration = time.time() - started
+    with _metrics_lock:
+        _metrics["sweeps"] += 1
+        _metrics["last_sweep_at"] = started
+        _metrics["last_sweep_seconds"] = round(duration, 3)
+        _metrics["objects_evicted"] += evicted
+        _metrics["output_files_removed"] += output_files["removed"]
+        _metrics["cache_entries_removed"] += cache["removed"]
+        _metrics["bytes_reclaimed"] += reclaimed
+        _metrics["last_bytes_reclaimed"] = reclaimed
+        _metrics["skipped_pinned"] += skipped
+    
+    if evicted or output_files["removed"] or cache["removed"]:
+        logger.info(
+            f"Retention sweep evicted {evicted} objects, {output_files['removed']} output files "
+            f"and {cache['removed']} cache entries, reclaimed {reclaimed} bytes"
+        )
+    return {
+        "objects_evicted": evicted,
+        "output_files_removed": output_files["removed"],
+        "cache_entries_removed": cache["removed"],
+        "bytes_reclaimed": reclaimed,
+        "skipped_pinned": skipped,
+        "stored_bytes": stored_bytes,
+    }
+
+def get_metrics() -> Dict:
+    """Cumulative sweeper metrics plus the current storage footprint"""
+    objects = storage_service.get_index().objects()
+    blob_sizes = {obj["digest"]: obj["size"] for obj in objects}
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    metrics.update({
+        "stored_objects": len(objects),
+        "stored_blobs": len(blob_sizes),
+        "stored_bytes": sum(blob_sizes.values()),
+        "pinned_blobs": storage_service.pinned_count(),
+        "ttl_hours": config.RETENTION_TTL_HOURS,
+        "quota_bytes": config.STORAGE_QUOTA_BYTES,
+        "cached_bytes": sum(size for _, size, _ in _cache_entries()),
+        "cache_quota_bytes": config.CACHE_QUOTA_BYTES,
+    })
+    return metrics
+
+async def _run():
+    while True:
+        try:
+            await run_in_threadpool(sweep)
+        except Exception as e:
+            logger.error(f"Retention sweep failed: {str(e)}")
+        await asyncio.sleep(config.RETENTION_SWEEP_INTERVAL_SECONDS)
+
+async def _renew_pins():
+    # Pins outlive their process by at most PIN_LEASE_SECONDS, so renew well inside that
+    while True:
+        await asyncio.sleep(config.PIN_LEASE_SECONDS / 3)
+        try:
+            await run_in_threadpool(storage_service.renew_pins)
+        except Exception as e:
+            logger.error(f"Renewing storage pins failed: {str(e)}")
+
+def start():
+    """Start the background sweeper and the pin renewal task"""
+    global _task, _renew_task
+    if _renew_task is None:
+        # Needed even when this process does not sweep: another one might
+        _renew_task = asyncio.create_task(_renew_pins())
+    if _task is None and config.RETENTION_SWEEP_INTERVAL_SECONDS > 0:
+        _task = asyncio.create_task(_run())
+
+async def stop():
+    global _task, _renew_task
+    tasks = [task for task in (_task, _renew_task) if task is not None]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _task = None
+    _renew_task = None
@@ -0,0 +1,164 @@
+"""
+Access-token revocation.
+
+Tokens carry a unique `jti` claim. Logging out records the jti and the
+token's expiry in the token_blacklist collection, where a TTL index on
+expires_at (see services/mongo_schema.py) removes entries once the token could no longer be used anyway.
+Every process keeps the live revocations in memory and pulls new ones
+incrementally (by revoked_at) every REVOCATION_REFRESH_SECONDS, so checking
+a token costs no network I/O. Tokens issued before jti was added are
+tracked by their full token string, as the blacklist always did.
+"""
+
+import asyncio
+import calendar
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from jose import JWTError, jwt
+
+import config
+from services import mongo_client
+
+logger = logging.getLogger(__name__)
+
+# jti -> expiry (unix time) for revoked tokens, and the same for pre-jti tokens keyed by token
+_revoked_ids: Dict[str, float] = {}
+_revoked_tokens: Dict[str, float] = {}
+_lock = threading.Lock()
+_last_revoked_at: Optional[datetime] = None
+_synced = False
+# The initial load in flight, shared by every check that arrives before it completes
+_initial_load: Optional[asyncio.Future] = None
+_task: Optional[asyncio.Task] = None
+
+def new_token_id() -> str:
+    """Unique ID for the jti claim of a new access token"""
+    return uuid.uuid4().hex
+
+def _claims(token: str) -> Dict:
+    try:
+        return jwt.get_unverified_claims(token)
+    except JWTError:
+        return {}
+
+def _expiry(claims: Dict) -> float:
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        return float(exp)
+    # No usable expiry: keep it for the longest lifetime we issue
+    return time.time() + config.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+def _unix_time(value: datetime) -> float:
+    """Unix time of a naive UTC datetime (as stored by revoke and returned by Motor)"""
+    return calendar.timegm(value.utctimetuple()) + value.microsecond / 1e6
+
+def _remember(entry: Dict, expires: Optional[float] = None):
+    if expires is None:
+        if isinstance(entry.get("expires_at"), datetime):
+            expires = _unix_time(entry["expires_at"])
+        else:
+            expires = _expiry(_claims(entry.get("token", "")))
+    with _lock:
+        if entry.get("jti"):
+            _revoked_ids[entry["jti"]] = expires
+        elif entry.get("token"):
+            _revoked_tokens[entry["token"]] = expires
+
+def _prune():
+    now = time.time()
+    with _lock:
+        for revoked in (_revoked_ids, _revoked_tokens):
+            for key in [key for key, expires in revoked.items() if expires < now]:
+                del revoked[key]
+
+async def refresh():
+    """Pull revocations recorded since the last refresh (everything still live on the first run)"""
+    global _last_revoked_at, _synced
+    if _last_revoked_at is None:
+        query = {"$or": [{"expires_at": {"$gt": datetime.utcnow()}}, {"expires_at": {"$exists": False}}]}
+    else:
+        # Re-read an overlap window so revocations stamped slightly earlier (clock skew between
+        # instances, out-of-order commits) are not skipped; re-adding a known entry is a no-op
+        overlap = timedelta(seconds=config.REVOCATION_REFRESH_OVERLAP_SECONDS)
+        query = {"revoked_at": {"$gt": _last_revoked_at - overlap}}
+    
+    latest = _last_revoked_at
+    async for entry in mongo_client.blacklist().find(query, {"_id": 0, "jti": 1, "token": 1, "expires_at": 1, "revoked_at": 1}):
+        _remember(entry)
+        revoked_at = entry.get("revoked_at")
+        if revoked_at is not None and (latest is None or revoked_at > latest):
+            latest = revoked_at
+    if latest is None:
+        # Nothing revoked yet: start the incremental window from now
+        latest = datetime.utcnow()
+    _last_revoked_at = latest
+    _synced = True
+    _prune()
+
+async def _load():
+    """Run the initial refresh once, however many callers are waiting for it"""
+    global _initial_load
+    if _initial_load is None or _initial_load.done():
+        # A failed load is retried by the next caller
+        _initial_load = asyncio.ensure_future(refresh())
+    # Shielded so one cancelled request does not abort the load for the others
+    await asyncio.shield(_initial_load)
+
+async def revoke(token: str):
+    """Revoke a token until it expires"""
+    claims = _claims(token)
+    expires = _expiry(claims)
+    entry = {
+        "expires_at": datetime.utcfromtimestamp(expires),
+        "revoked_at": datetime.utcnow(),
+    }
+    if claims.get("jti"):
+        entry["jti"] = claims["jti"]
+    else:
+        entry["token"] = token
+    await mongo_client.blacklist().insert_one(dict(entry))
+    _remember(entry, expires)
+
+async def is_revoked(token: str) -> bool:
+    """Check a token against the local revocation set"""
+    if not _synced:
+        await _load()
+    jti = _claims(token).get("jti")
+    now = time.time()
+    with _lock:
+        if jti:
+            expires = _revoked_ids.get(jti)
+        else:
+            expires = _revoked_tokens.get(token)
+    return expires is not None and expires >= now
+
+async def _run():
+    while True:
+        await asyncio.sleep(config.REVOCATION_REFRESH_SECONDS)
+        try:
+            await refresh()
+        except Exception as e:
+            logger.error(f"Revocation refresh failed: {str(e)}")
+
+async def start():
+    """Load live revocations and start the incremental refresh task"""
+    global _task
+    try:
+        await _load()
+    except Exception as e:
+        # Checks retry the initial load until it succeeds
+        logger.error(f"Initial revocation load failed: {str(e)}")
+    if _task is None:
+        _task = asyncio.create_task(_run())
+
+async def stop():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+        _task = None
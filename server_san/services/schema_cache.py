@@ -0,0 +1,79 @@
+"""
+Cache of template JSON schemas produced by LLM_CALL_1.
+
+Entries are keyed by the SHA-256 of the template file together with the
+version of the LLM1 prompt, so a repeat generation with the same template
+skips text extraction and one full LLM round trip. Lookups go through an
+in-memory LRU first and then an on-disk tier that survives restarts.
+"""
+
+import copy
+import json
+import logging
+import os
+from typing import Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+import config
+from services import data_service, llm_service, text_cache
+from utils.cache_utils import DiskStore, LRUCache, file_sha256, text_sha256
+
+logger = logging.getLogger(__name__)
+
+_memory_cache = LRUCache(config.SCHEMA_CACHE_SIZE)
+_disk_cache = DiskStore(os.path.join(config.CACHE_DIR, "schemas"), ".json")
+
+def prompt_version() -> str:
+    """Short hash of the LLM1 system prompt and model; changes invalidate cached schemas"""
+    prompt = ""
+    prompt_path = os.path.join(config.PROMPTS_DIR, "LLM1.txt")
+    if os.path.exists(prompt_path):
+        with open(prompt_path, "r") as f:
+            prompt = f.read()
+    return text_sha256(f"{llm_service.MODEL}\n{prompt}")[:16]
+
+def cache_key(template_digest: str) -> str:
+    """Cache key for a template: content hash plus prompt version"""
+    return f"{template_digest}-{prompt_version()}"
+
+def get(key: str) -> Optional[Dict]:
+    """Look up a cached schema, promoting disk hits into memory"""
+    schema = _memory_cache.get(key)
+    if schema is None:
+        data = _disk_cache.get(key)
+        if data is None:
+            return None
+        try:
+            schema = json.loads(data.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            logger.warning(f"Discarding unreadable schema cache entry {key}")
+            return None
+        _memory_cache.put(key, schema)
+    return copy.deepcopy(schema)
+
+def put(key: str, schema: Dict):
+    """Store a schema in both cache tiers"""
+    _memory_cache.put(key, copy.deepcopy(schema))
+    try:
+        _disk_cache.put(key, json.dumps(schema).encode("utf-8"))
+    except OSError as e:
+        logger.warning(f"Could not persist schema cache entry {key}: {str(e)}")
+
+async def get_template_schema(template_path: str) -> Dict:
+    """Return the JSON schema for a template, running LLM_CALL_1 only on a cache miss"""
+    template_digest = await run_in_threadpool(file_sha256, template_path)
+    key = cache_key(template_digest)
+    schema = get(key)
+    if schema is not None:
+        logger.info(f"Template schema cache hit for {os.path.basename(template_path)}")
+        return schema
+    
+    template_text = await text_cache.get_text_async(template_path, template_digest)
+    print("Templete text for input",template_text)
+    schema = await data_service.process_template_json_async(template_text)
+    
+    # Do not cache the default schema returned when the LLM call failed
+    if schema != data_service.default_template_schema():
+        put(key, schema)
+    return schema
@@ -0,0 +1,385 @@
+"""
+Content-addressable storage for uploads and generated documents.
+
+Blobs are stored once per distinct content under
+STORAGE_DIR/<ab>/<cd>/<sha256><ext> (the extension it was first stored
+with), so identical uploads are deduplicated and no directory grows beyond
+a few thousand entries. A SQLite index maps
+logical names (the original or generated filename) to blobs and keeps a
+reference count per blob; a blob is deleted when its last name is released.
+Pins are stored in the same index as leases, so the retention sweeper in any
+worker process sees the inputs a job in another process is using.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+import config
+from utils import upload_utils
+from utils.cache_utils import file_sha256
+
+logger = logging.getLogger(__name__)
+
+_BLOB_NAME_PATTERN = re.compile(r"([0-9a-f]{64})(\.[A-Za-z0-9]+)?")
+
+# Returned by StorageIndex.remove(unless_pinned=True) for a pinned blob
+PINNED = {"pinned": True}
+
+class StoredObject(NamedTuple):
+    name: str
+    digest: str
+    path: str
+    size: int
+    # True if this call created the name -> blob reference (and so may release it)
+    is_new: bool = False
+
+def _extension(name: str) -> str:
+    return os.path.splitext(name)[1].lower()
+
+def blob_path(digest: str, ext: str = "") -> str:
+    """Sharded location of a blob: STORAGE_DIR/ab/cd/<digest><ext>"""
+    return os.path.join(config.STORAGE_DIR, digest[:2], digest[2:4], f"{digest}{ext}")
+
+class StorageIndex:
+    """SQLite index of blobs (with reference counts) and the logical names pointing at them"""
+
+    def __init__(self, db_path: str):
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    ext TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    refcount INTEGER NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS objects (
+                    name TEXT NOT NULL,
+                    digest TEXT NOT NULL REFERENCES blobs (digest),
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (name, digest)
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS objects_digest ON objects (digest)")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pins (
+                    id TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pins_digest ON pins (digest, expires_at)")
+
+    def add(self, name: str, digest: str, ext: str, size: int) -> bool:
+        """Record a name for a blob; returns True if the name -> blob reference is new"""
+        now = time.time()
+        with self._lock, self._conn:
+            blob_is_new = self._conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone() is None
+            if blob_is_new:
+                self._conn.execute(
+                    "INSERT INTO blobs (digest, ext, size, refcount, created_at) VALUES (?, ?, ?, 0, ?)",
+                    (digest, ext, size, now),
+                )
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO objects (name, digest, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (name, digest, now, now),
+            ).rowcount
+            if inserted:
+                self._conn.execute("UPDATE blobs SET refcount = refcount + 1 WHERE digest = ?", (digest,))
+            else:
+                self._conn.execute(
+                    "UPDATE objects SET created_at = ?, last_access = ? WHERE name = ? AND digest = ?",
+                    (now, now, name, digest),
+                )
+        return bool(inserted)
+
+    def lookup(self, name: str) -> Optional[Dict]:
+        """Most recent object stored under a logical name"""
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT o.name, o.digest, b.ext, b.size FROM objects o JOIN blobs b ON b.digest = o.digest
+                WHERE o.name = ? ORDER BY o.created_at DESC LIMIT 1
+                """,
+                (name,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def lookup_digest(self, digest: str) -> Optional[Dict]:
+        """A blob and the most recent logical name pointing at it"""
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT o.name, b.digest, b.ext, b.size FROM blobs b LEFT JOIN objects o ON o.digest = b.digest
+                WHERE b.digest = ? ORDER BY o.created_at DESC LIMIT 1
+                """,
+                (digest,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def touch(self, name: str, digest: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE objects SET last_access = ? WHERE name = ? AND digest = ?",
+                (time.time(), name, digest),
+            )
+
+    def touch_digests(self, digests: Iterable[str]):
+        """Mark every name pointing at these blobs as accessed now"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE objects SET last_access = ? WHERE digest = ?",
+                [(now, digest) for digest in digests],
+            )
+
+    def add_pins(self, pins: List[Tuple[str, str]], owner: str):
+        """Record (pin id, digest) leases held by owner"""
+        expires_at = time.time() + config.PIN_LEASE_SECONDS
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO pins (id, digest, owner, expires_at) VALUES (?, ?, ?, ?)",
+                [(pin_id, digest, owner, expires_at) for pin_id, digest in pins],
+            )
+
+    def remove_pins(self, pin_ids: Iterable[str]):
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM pins WHERE id = ?", [(pin_id,) for pin_id in pin_ids])
+
+    def renew_pins(self, owner: str):
+        """Extend every pin held by owner and drop pins whose lease lapsed"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE pins SET expires_at = ? WHERE owner = ?", (now + config.PIN_LEASE_SECONDS, owner))
+            self._conn.execute("DELETE FROM pins WHERE expires_at < ?", (now,))
+
+    def pinned_digests(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(DISTINCT digest) FROM pins WHERE expires_at >= ?", (time.time(),)
+            ).fetchone()
+        return row[0]
+
+    def remove(self, name: str, digest: str, unless_pinned: bool = False) -> Optional[Dict]:
+        """Drop a name; returns the blob row if this was its last reference.
+        With unless_pinned, returns PINNED (and keeps the name) while any process holds a pin on the blob"""
+        with self._lock, self._conn:
+            # Take the write lock first so a pin cannot land between the check and the delete
+            self._conn.execute("BEGIN IMMEDIATE")
+            if unless_pinned and self._conn.execute(
+                "SELECT 1 FROM pins WHERE digest = ? AND expires_at >= ? LIMIT 1", (digest, time.time())
+            ).fetchone():
+                return PINNED
+            removed = self._conn.execute(
+                "DELETE FROM objects WHERE name = ? AND digest = ?", (name, digest)
+            ).rowcount
+            if not removed:
+                return None
+            self._conn.execute("UPDATE blobs SET refcount = refcount - 1 WHERE digest = ?", (digest,))
+            row = self._conn.execute(
+                "SELECT digest, ext, size FROM blobs WHERE digest = ? AND refcount <= 0", (digest,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            return dict(row)
+
+    def objects(self) -> List[Dict]:
+        """Every stored object with its blob size"""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT o.name, o.digest, b.ext, b.size, o.created_at, o.last_access
+                FROM objects o JOIN blobs b ON b.digest = o.digest
+                """
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_index: Optional[StorageIndex] = None
+_index_lock = threading.Lock()
+
+# Serializes blob creation with blob deletion, so put_file never records a name for a
+# blob that release is removing at the same time
+_blob_lock = threading.Lock()
+
+# Owner of the pins taken by this process (renewed by renew_pins)
+_pin_owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+
+def get_index() -> StorageIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = StorageIndex(config.STORAGE_DB_PATH)
+        return _index
+
+def _to_object(name: str, row: Dict) -> StoredObject:
+    return StoredObject(name, row["digest"], blob_path(row["digest"], row["ext"]), row["size"])
+
+def put_file(source_path: str, name: Optional[str] = None, digest: Optional[str] = None) -> StoredObject:
+    """Move a file into storage under a logical name; duplicate content is stored only once"""
+    name = name or os.path.basename(source_path)
+    digest = digest or file_sha256(source_path)
+    size = os.path.getsize(source_path)
+    
+    with _blob_lock:
+        # Same bytes already stored (possibly under another extension): keep the existing blob
+        existing = get_index().lookup_digest(digest)
+        ext = existing["ext"] if existing else _extension(name)
+        path = blob_path(digest, ext)
+        
+        if os.path.exists(path):
+            os.remove(source_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                os.replace(source_path, path)
+            except OSError:
+                # Source on another filesystem
+                temp_path = f"{path}.part"
+                shutil.move(source_path, temp_path)
+                os.replace(temp_path, path)
+        
+        is_new = get_index().add(name, digest, ext, size)
+    return StoredObject(name, digest, path, size, is_new)
+
+def blob_name(data: bytes, name: str) -> str:
+    """Blob file name (<sha256><ext>) the given bytes are stored under; usable with /generate/download"""
+    return f"{hashlib.sha256(data).hexdigest()}{_extension(name)}"
+
+def put_bytes(data: bytes, name: str) -> StoredObject:
+    """Store in-memory content under a logical name"""
+    temp_path = os.path.join(config.UPLOAD_TMP_DIR, f"{uuid.uuid4().hex}{_extension(name)}")
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    try:
+        return put_file(temp_path, name, hashlib.sha256(data).hexdigest())
+    finally:
+        upload_utils.remove_upload(temp_path)
+
+async def save_upload(file: UploadFile, name: Optional[str] = None) -> StoredObject:
+    """Stream an upload into storage"""
+    name = name or file.filename
+    temp_path, digest = await upload_utils.save_upload_temp(file, _extension(name))
+    try:
+        return await run_in_threadpool(put_file, temp_path, name, digest)
+    finally:
+        upload_utils.remove_upload(temp_path)
+
+def resolve(name: str) -> Optional[StoredObject]:
+    """Find a stored object by logical name or by blob file name (<sha256><ext>) and mark it accessed"""
+    row = get_index().lookup(name)
+    if row is None:
+        match = _BLOB_NAME_PATTERN.fullmatch(name)
+        if match is None:
+            return None
+        row = get_index().lookup_digest(match.group(1))
+        if row is None:
+            return None
+    
+    stored = _to_object(row["name"] or name, row)
+    if not os.path.exists(stored.path):
+        logger.warning(f"Storage index points at a missing blob: {stored.path}")
+        return None
+    if row["name"]:
+        get_index().touch(row["name"], row["digest"])
+    return stored
+
+def _release(name: str, digest: str, unless_pinned: bool) -> Optional[int]:
+    with _blob_lock:
+        blob = get_index().remove(name, digest, unless_pinned)
+        if blob is PINNED:
+            return None
+        if blob is None:
+            return 0
+        try:
+            os.remove(blob_path(blob["digest"], blob["ext"]))
+        except FileNotFoundError:
+            pass
+    return blob["size"]
+
+def release(name: str, digest: str) -> int:
+    """Drop a logical name; deletes the blob when no names refer to it. Returns bytes freed"""
+    return _release(name, digest, unless_pinned=False)
+
+def release_unless_pinned(name: str, digest: str) -> Optional[int]:
+    """release() for the retention sweeper; returns None (and keeps the object) while any process pins it"""
+    return _release(name, digest, unless_pinned=True)
+
+def digest_for_path(path: Optional[str]) -> Optional[str]:
+    """Digest of a stored blob path, or None for paths outside storage"""
+    if not path:
+        return None
+    storage_dir = os.path.abspath(config.STORAGE_DIR)
+    if os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(path)))) != storage_dir:
+        return None
+    match = _BLOB_NAME_PATTERN.fullmatch(os.path.basename(path))
+    return match.group(1) if match else None
+
+def pin(paths: Iterable[Optional[str]]) -> List[str]:
+    """Protect the blobs behind these paths from eviction in every process; returns pin IDs for unpin"""
+    digests = [digest for digest in map(digest_for_path, paths) if digest]
+    if not digests:
+        return []
+    pins = [(uuid.uuid4().hex, digest) for digest in digests]
+    get_index().add_pins(pins, _pin_owner)
+    # Pinning means a job is using the inputs: that counts as access for LRU/TTL eviction
+    get_index().touch_digests(digests)
+    return [pin_id for pin_id, _ in pins]
+
+def unpin(pin_ids: Iterable[str]):
+    pin_ids = list(pin_ids)
+    if pin_ids:
+        get_index().remove_pins(pin_ids)
+
+def renew_pins():
+    """Keep this process's pins alive; called periodically by the retention service"""
+    get_index().renew_pins(_pin_owner)
+
+@contextmanager
+def pinned(*paths: Optional[str]) -> Iterator[None]:
+    """Keep the given stored files from being evicted for the duration of the block"""
+    pin_ids = pin(paths)
+    try:
+        yield
+    finally:
+        unpin(pin_ids)
+
+def pinned_count() -> int:
+    """Blobs currently pinned by any process"""
+    return get_index().pinned_digests()
+
+def close():
+    global _index
+    with _index_lock:
+        if _index is not None:
+            _index.close()
+            _index = None
@@ -0,0 +1,68 @@
+"""
+Content-addressed store of extracted document text.
+
+Text is keyed by the SHA-256 of the file bytes (plus any extraction budget),
+so a document uploaded once is parsed once: /upload/resume fills the store
+and /generate/resume reads the template, old resume and old cover letter
+back from it. Entries live in an in-memory LRU with an on-disk tier.
+"""
+
+import logging
+import os
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+import config
+from utils import extract_pool, file_utils
+from utils.cache_utils import DiskStore, LRUCache, file_sha256
+
+logger = logging.getLogger(__name__)
+
+_memory_cache = LRUCache(config.TEXT_CACHE_SIZE)
+_disk_cache = DiskStore(os.path.join(config.CACHE_DIR, "text"), ".txt")
+
+def cache_key(digest: str) -> str:
+    """Key for a document hash; extraction budgets are part of the key when set"""
+    if config.EXTRACT_MAX_PAGES > 0 or config.EXTRACT_MAX_CHARS > 0:
+        return f"{digest}-p{config.EXTRACT_MAX_PAGES}-c{config.EXTRACT_MAX_CHARS}"
+    return digest
+
+def get_cached(digest: str) -> Optional[str]:
+    """Return cached text for a document hash, promoting disk hits into memory"""
+    key = cache_key(digest)
+    text = _memory_cache.get(key)
+    if text is None:
+        data = _disk_cache.get(key)
+        if data is None:
+            return None
+        text = data.decode("utf-8")
+        _memory_cache.put(key, text)
+    return text
+
+def put(digest: str, text: str):
+    """Store extracted text in both tiers"""
+    key = cache_key(digest)
+    _memory_cache.put(key, text)
+    try:
+        _disk_cache.put(key, text.encode("utf-8"))
+    except OSError as e:
+        logger.warning(f"Could not persist extracted text {key}: {str(e)}")
+
+def get_text(file_path: str, digest: Optional[str] = None) -> str:
+    """Return the text of a document, extracting it only the first time its content is seen"""
+    digest = digest or file_sha256(file_path)
+    text = get_cached(digest)
+    if text is None:
+        text = file_utils.extract_text_from_file(file_path)
+        put(digest, text)
+    return text
+
+async def get_text_async(file_path: str, digest: Optional[str] = None) -> str:
+    """get_text without blocking the event loop; misses are extracted in the process pool"""
+    digest = digest or await run_in_threadpool(file_sha256, file_path)
+    text = await run_in_threadpool(get_cached, digest)
+    if text is None:
+        text = await extract_pool.extract_text(file_path)
+        await run_in_threadpool(put, digest, text)
+    return text
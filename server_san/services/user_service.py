@@ -1,12 +1,12 @@
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import Optional
 
 from models.schema import UserCreate, User, UserInDB
 from database import get_db, SessionLocal
+from services import password_hasher
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = password_hasher.pwd_context
 
 def get_password_hash(password: str) -> str:
     """
@@ -20,6 +20,18 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     return pwd_context.verify(plain_password, hashed_password)
 
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password on the bounded hashing pool
+    """
+    return await password_hasher.hash_password(password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the bounded hashing pool
+    """
+    return await password_hasher.verify_password(plain_password, hashed_password)
+
 def get_user_by_username(username: str) -> Optional[User]:
     """
     Get a user by username from the database
@@ -0,0 +1,44 @@
+import math
+import os
+import sys
+
+import pytest
+
+# Tests import the app modules the way main.py does, from the server_san directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+
+SAMPLE_SKILL_MATRIX = os.path.join(config.BASE_PATH, "Output", "Copy of VHS_Skill_Matrix.xlsx")
+
+def same_value(a, b) -> bool:
+    """Equal and of the same type (NaN matches NaN)"""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, float) and math.isnan(a):
+        return math.isnan(b)
+    return a == b
+
+def assert_same_sheets(expected, actual):
+    """Sheets hold the same records, key order and value types included"""
+    assert [sheet["Sheet Name"] for sheet in actual] == [sheet["Sheet Name"] for sheet in expected]
+    for expected_sheet, actual_sheet in zip(expected, actual):
+        assert len(actual_sheet["Data"]) == len(expected_sheet["Data"])
+        for expected_record, actual_record in zip(expected_sheet["Data"], actual_sheet["Data"]):
+            assert list(actual_record) == list(expected_record)
+            for key, value in expected_record.items():
+                assert same_value(value, actual_record[key]), (expected_sheet["Sheet Name"], key, value, actual_record[key])
+
+@pytest.fixture(autouse=True)
+def isolated_dirs(tmp_path, monkeypatch):
+    """Point every cache, storage and output location at a fresh temporary directory"""
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(config, "STORAGE_DIR", str(tmp_path / "storage"))
+    monkeypatch.setattr(config, "STORAGE_DB_PATH", str(tmp_path / "storage" / "index.db"))
+    monkeypatch.setattr(config, "UPLOAD_TMP_DIR", str(tmp_path / "cache" / "uploads"))
+    monkeypatch.setattr(config, "OUTPUT_DIR", str(tmp_path / "output"))
+    monkeypatch.setattr(config, "RENDER_DIR", str(tmp_path / "output" / "renders"))
+    monkeypatch.setattr(config, "JOBS_DB_PATH", str(tmp_path / "jobs.db"))
+    for directory in (config.STORAGE_DIR, config.UPLOAD_TMP_DIR, config.RENDER_DIR):
+        os.makedirs(directory, exist_ok=True)
+    yield tmp_path
@@ -0,0 +1,39 @@
+import asyncio
+import io
+import json
+import zipfile
+
+from models.schema import BatchResumeRequest
+from services import batch_service, data_service, generation_service, schema_cache
+
+EMPLOYEES = [
+    {"ID": 1, "First_Name": "Ada", "Last_Name": "Lovelace", "Sheet Name": "Practice"},
+    {"ID": 2, "First_Name": "Alan", "Last_Name": "Turing", "Sheet Name": "Practice"},
+]
+
+def test_zip_stream_holds_pdfs_and_manifest(monkeypatch):
+    async def get_template_schema(template_path):
+        return {}
+    
+    async def process_resume_data_async(schema, resume_path, job_description, skill_matrix_json):
+        return json.loads(skill_matrix_json)[0]
+    
+    async def render_resume_bytes(data, template_id, fallback=True):
+        if data["ID"] == 2:
+            raise Exception("template failed")
+        return "resume.pdf", f"%PDF {data['First_Name']}".encode()
+    
+    monkeypatch.setattr(schema_cache, "get_template_schema", get_template_schema)
+    monkeypatch.setattr(data_service, "process_resume_data_async", process_resume_data_async)
+    monkeypatch.setattr(generation_service, "render_resume_bytes", render_resume_bytes)
+    
+    async def collect():
+        request = BatchResumeRequest(template_path="template.pdf", dataset_id="dataset")
+        return b"".join([chunk async for chunk in batch_service.stream_batch_zip(request, EMPLOYEES)])
+    
+    archive = zipfile.ZipFile(io.BytesIO(asyncio.run(collect())))
+    assert sorted(archive.namelist()) == ["1_Ada_Lovelace_Resume.pdf", "manifest.json"]
+    assert archive.read("1_Ada_Lovelace_Resume.pdf") == b"%PDF Ada"
+    manifest = {entry["ID"]: entry for entry in json.loads(archive.read("manifest.json"))}
+    assert manifest[1]["status"] == "generated"
+    assert manifest[2] == {"ID": 2, "sheet_name": "Practice", "status": "failed", "error": "template failed"}
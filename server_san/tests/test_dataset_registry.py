@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from conftest import SAMPLE_SKILL_MATRIX, assert_same_sheets
+from services import dataset_registry
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    dataset_registry._datasets.clear()
+    yield
+    dataset_registry._datasets.clear()
+
+def _write_matrix(path, first_name):
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({"Info": ["cover sheet"]}).to_excel(writer, sheet_name="Cover", index=False)
+        pd.DataFrame({
+            "First Name": [first_name],
+            "Last Name": ["Lee"],
+            "Experience": [3],
+            "Expertise": ["Python"],
+        }).to_excel(writer, sheet_name="Practice", index=False)
+    return str(path)
+
+def test_evicted_dataset_is_reloaded_from_its_snapshot():
+    dataset = dataset_registry.load_file(SAMPLE_SKILL_MATRIX, "matrix.xlsx")
+    records = dataset.sheets_data
+    
+    # Another worker (or an LRU eviction) has nothing in memory
+    dataset_registry._datasets.clear()
+    reloaded = dataset_registry.get(dataset.dataset_id)
+    
+    assert reloaded is not None
+    assert reloaded.filename == "matrix.xlsx"
+    assert_same_sheets(records, reloaded.sheets_data)
+
+def test_uploads_do_not_overwrite_each_other(tmp_path):
+    first = dataset_registry.load_file(_write_matrix(tmp_path / "a.xlsx", "Ann"))
+    second = dataset_registry.load_file(_write_matrix(tmp_path / "b.xlsx", "Bob"))
+    
+    assert first.dataset_id != second.dataset_id
+    assert dataset_registry.resolve(first.dataset_id).find_by_name("ann", "lee")
+    assert not dataset_registry.resolve(first.dataset_id).find_by_name("bob", "lee")
+    assert dataset_registry.resolve(second.dataset_id).find_by_name("bob", "lee")
+
+def test_resolve_requires_a_dataset():
+    with pytest.raises(dataset_registry.DatasetNotFoundError):
+        dataset_registry.resolve()
+    with pytest.raises(dataset_registry.DatasetNotFoundError):
+        dataset_registry.resolve("f" * 64)
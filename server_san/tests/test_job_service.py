@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+import config
+from services import job_service
+
+REQUEST = {"template_path": "template.pdf"}
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(job_service, "_store", None)
+    yield job_service._get_store()
+    job_service._get_store().close()
+
+def test_live_lease_is_not_reclaimed(store):
+    store.create("job-1", REQUEST, owner="worker-a")
+    
+    assert store.claim_expired("worker-b") == []
+    assert store.owned_by("job-1", "worker-a")
+
+def test_expired_lease_is_reclaimed_by_exactly_one_worker(store, monkeypatch):
+    monkeypatch.setattr(config, "JOB_LEASE_SECONDS", -1)
+    store.create("job-1", REQUEST, owner="worker-a")
+    monkeypatch.setattr(config, "JOB_LEASE_SECONDS", 60)
+    
+    claimed = store.claim_expired("worker-b")
+    assert [job["id"] for job in claimed] == ["job-1"]
+    # worker-b now holds a live lease, so nobody else can take it
+    assert store.claim_expired("worker-c") == []
+    assert store.owned_by("job-1", "worker-b")
+
+def test_released_jobs_are_reclaimable_immediately(store):
+    store.create("job-1", REQUEST, owner="worker-a")
+    store.release_leases("worker-a")
+    
+    assert [job["id"] for job in store.claim_expired("worker-b")] == ["job-1"]
+
+def test_finished_jobs_are_never_reclaimed(store):
+    store.create("job-1", REQUEST, owner="worker-a")
+    store.update("job-1", status=job_service.STATUS_COMPLETED)
+    store.release_leases("worker-a")
+    
+    assert store.claim_expired("worker-b") == []
+
+def test_worker_skips_jobs_owned_by_another_process(store, monkeypatch):
+    runs = []
+    
+    async def fake_generation(request, progress=None):
+        runs.append(request)
+        return {"resume_path": "resume.pdf"}
+    
+    monkeypatch.setattr(job_service.generation_service, "run_generation", fake_generation)
+    monkeypatch.setattr(job_service, "_owner", "worker-a")
+    store.create("theirs", REQUEST, owner="worker-b")
+    store.create("ours", REQUEST, owner="worker-a")
+    
+    asyncio.run(job_service._run_job("theirs"))
+    asyncio.run(job_service._run_job("ours"))
+    
+    assert len(runs) == 1
+    assert store.get("theirs")["status"] == job_service.STATUS_QUEUED
+    assert store.get("ours")["status"] == job_service.STATUS_COMPLETED
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+import config
+from utils import output_allocator
+
+def test_same_filename_gets_distinct_paths():
+    first = output_allocator.allocate("Jane_Doe_Resume.pdf")
+    second = output_allocator.allocate("Jane_Doe_Resume.pdf")
+    
+    assert first != second
+    assert os.path.basename(first) == os.path.basename(second) == "Jane_Doe_Resume.pdf"
+    assert os.path.dirname(os.path.dirname(first)) == config.RENDER_DIR
+
+def test_failed_write_leaves_nothing_behind():
+    path = output_allocator.allocate("resume.pdf")
+    
+    def write(temp_path):
+        with open(temp_path, "wb") as f:
+            f.write(b"partial")
+        raise RuntimeError("render failed")
+    
+    with pytest.raises(RuntimeError):
+        output_allocator.write_atomic(path, write)
+    assert os.listdir(os.path.dirname(path)) == []
+
+def test_release_removes_file_and_directory():
+    path = output_allocator.allocate("resume.pdf")
+    output_allocator.write_atomic(path, lambda temp_path: open(temp_path, "wb").close())
+    
+    output_allocator.release(path)
+    assert not os.path.exists(os.path.dirname(path))
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import pytest
+from jose import jwt
+
+from services import mongo_client, revocation_service
+
+class FakeBlacklist:
+    """Just enough of the token_blacklist collection for revocation_service"""
+    
+    def __init__(self):
+        self.entries = []
+        self.finds = 0
+    
+    async def insert_one(self, entry):
+        self.entries.append(entry)
+    
+    def find(self, query, projection=None):
+        self.finds += 1
+        return self._iterate()
+    
+    async def _iterate(self):
+        # Yield to the event loop like a real cursor would
+        await asyncio.sleep(0.01)
+        for entry in list(self.entries):
+            yield entry
+
+@pytest.fixture
+def blacklist(monkeypatch):
+    collection = FakeBlacklist()
+    monkeypatch.setattr(mongo_client, "blacklist", lambda: collection)
+    monkeypatch.setattr(revocation_service, "_revoked_ids", {})
+    monkeypatch.setattr(revocation_service, "_revoked_tokens", {})
+    monkeypatch.setattr(revocation_service, "_last_revoked_at", None)
+    monkeypatch.setattr(revocation_service, "_synced", False)
+    monkeypatch.setattr(revocation_service, "_initial_load", None)
+    return collection
+
+def make_token(**claims) -> str:
+    claims.setdefault("exp", int(time.time()) + 600)
+    return jwt.encode({"sub": "user@example.com", **claims}, "test-secret", algorithm="HS256")
+
+def test_revoked_token_is_rejected(blacklist):
+    token = make_token(jti=revocation_service.new_token_id())
+    other = make_token(jti=revocation_service.new_token_id())
+    
+    async def scenario():
+        await revocation_service.revoke(token)
+        return await revocation_service.is_revoked(token), await revocation_service.is_revoked(other)
+    
+    assert asyncio.run(scenario()) == (True, False)
+    assert blacklist.entries[0]["jti"] == jwt.get_unverified_claims(token)["jti"]
+
+def test_revocation_seen_by_another_process_after_refresh(blacklist):
+    token = make_token(jti=revocation_service.new_token_id())
+    
+    async def scenario():
+        await revocation_service.revoke(token)
+        # A fresh process has none of this process's in-memory state
+        revocation_service._revoked_ids.clear()
+        revocation_service._synced = False
+        revocation_service._last_revoked_at = None
+        return await revocation_service.is_revoked(token)
+    
+    assert asyncio.run(scenario())
+
+def test_pre_jti_token_is_tracked_by_value(blacklist):
+    token = make_token()
+    
+    async def scenario():
+        await revocation_service.revoke(token)
+        return await revocation_service.is_revoked(token)
+    
+    assert asyncio.run(scenario())
+
+def test_concurrent_checks_share_one_initial_load(blacklist):
+    token = make_token(jti=revocation_service.new_token_id())
+    
+    async def scenario():
+        return await asyncio.gather(*(revocation_service.is_revoked(token) for _ in range(20)))
+    
+    assert asyncio.run(scenario()) == [False] * 20
+    assert blacklist.finds == 1
@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+
+from conftest import SAMPLE_SKILL_MATRIX, assert_same_sheets, same_value
+from utils import excel_utils, sheet_cache
+
+pytestmark = pytest.mark.skipif(not sheet_cache.is_enabled(), reason="pyarrow is not installed")
+
+def test_sample_workbook_round_trips_with_identical_records():
+    frames = excel_utils._parse_frames(pd.ExcelFile(SAMPLE_SKILL_MATRIX))
+    digest = "0" * 64
+    sheet_cache.store(digest, frames)
+    cached = sheet_cache.load(digest)
+    assert cached is not None
+    
+    assert_same_sheets(excel_utils._build_sheets(frames), excel_utils._build_sheets(cached))
+
+def test_mixed_type_column_keeps_each_cell_type():
+    df = pd.DataFrame({"Last_Name": pd.Series(["Lee", 7, 2.5, float("nan"), None, pd.Timestamp("2024-01-02")], dtype=object)})
+    sheet_cache.store("1" * 64, [("Sheet", df)])
+    (name, cached), = sheet_cache.load("1" * 64)
+    assert name == "Sheet"
+    for original, reloaded in zip(df["Last_Name"], cached["Last_Name"]):
+        assert same_value(original, reloaded)
@@ -0,0 +1,85 @@
+import os
+import uuid
+
+import pytest
+
+import config
+from services import retention_service, storage_service
+
+@pytest.fixture(autouse=True)
+def index(monkeypatch):
+    monkeypatch.setattr(storage_service, "_index", None)
+    yield storage_service.get_index()
+    storage_service.close()
+
+def expire_everything(monkeypatch):
+    # Any stored byte is over quota, so the sweep tries to evict every object
+    monkeypatch.setattr(config, "STORAGE_QUOTA_BYTES", 1)
+
+def test_duplicate_content_is_stored_once_and_refcounted():
+    first = storage_service.put_bytes(b"same bytes", "a.pdf")
+    second = storage_service.put_bytes(b"same bytes", "b.pdf")
+    
+    assert first.digest == second.digest
+    assert first.path == second.path
+    assert first.is_new and second.is_new
+    
+    assert storage_service.release("a.pdf", first.digest) == 0
+    assert os.path.exists(second.path)
+    assert storage_service.release("b.pdf", second.digest) == len(b"same bytes")
+    assert not os.path.exists(second.path)
+
+def test_pinned_blob_survives_sweep(monkeypatch):
+    stored = storage_service.put_bytes(b"input", "input.xlsx")
+    expire_everything(monkeypatch)
+    
+    with storage_service.pinned(stored.path):
+        result = retention_service.sweep()
+        assert result["objects_evicted"] == 0
+        assert result["skipped_pinned"] == 1
+        assert os.path.exists(stored.path)
+    
+    assert retention_service.sweep()["objects_evicted"] == 1
+    assert not os.path.exists(stored.path)
+
+def test_pin_from_another_process_is_honoured(monkeypatch):
+    stored = storage_service.put_bytes(b"input", "input.xlsx")
+    # A second connection to the same index stands in for another worker process
+    other = storage_service.StorageIndex(config.STORAGE_DB_PATH)
+    other.add_pins([(uuid.uuid4().hex, stored.digest)], "other-worker")
+    expire_everything(monkeypatch)
+    
+    assert storage_service.pinned_count() == 1
+    assert retention_service.sweep()["objects_evicted"] == 0
+    assert os.path.exists(stored.path)
+    other.close()
+
+def test_lapsed_pin_does_not_block_sweep(monkeypatch):
+    stored = storage_service.put_bytes(b"input", "input.xlsx")
+    monkeypatch.setattr(config, "PIN_LEASE_SECONDS", -1)
+    storage_service.get_index().add_pins([(uuid.uuid4().hex, stored.digest)], "crashed-worker")
+    expire_everything(monkeypatch)
+    
+    assert storage_service.pinned_count() == 0
+    assert retention_service.sweep()["objects_evicted"] == 1
+
+def test_cache_quota_evicts_least_recently_used_first(monkeypatch):
+    tier = os.path.join(config.CACHE_DIR, "text")
+    workbook = os.path.join(config.CACHE_DIR, "skill_matrix", "a" * 64)
+    os.makedirs(tier)
+    os.makedirs(workbook)
+    for age, path in enumerate([os.path.join(tier, "new.txt"), os.path.join(workbook, "0000.arrow"), os.path.join(tier, "old.txt")]):
+        with open(path, "wb") as f:
+            f.write(b"x" * 100)
+    os.utime(os.path.join(tier, "new.txt"), (3000, 3000))
+    os.utime(workbook, (2000, 2000))
+    os.utime(os.path.join(tier, "old.txt"), (1000, 1000))
+    with open(os.path.join(config.UPLOAD_TMP_DIR, "in-flight.xlsx"), "wb") as f:
+        f.write(b"x" * 1000)
+    monkeypatch.setattr(config, "CACHE_QUOTA_BYTES", 150)
+    
+    assert retention_service.sweep()["cache_entries_removed"] == 2
+    assert os.path.exists(os.path.join(tier, "new.txt"))
+    assert not os.path.exists(workbook)
+    assert not os.path.exists(os.path.join(tier, "old.txt"))
+    assert os.path.exists(os.path.join(config.UPLOAD_TMP_DIR, "in-flight.xlsx"))
@@ -0,0 +1,80 @@
+"""
+Registry of the static assets used by the PDF templates.
+
+The logo and the bullet image are resolved to absolute paths (and checked
+for existence) once per process; templates refer to them by handle. Image headers are decoded once too: the parsed image info is
+copied into each new PDF, so every document embeds an image once without
+re-reading the file, and per-bullet filesystem probes are gone.
+"""
+
+import os
+import threading
+from typing import Dict, NamedTuple, Optional
+
+import config
+
+LOGO = "logo"
+BULLET = "bullet"
+
+_SOURCES = {
+    LOGO: config.LOGO_PATH,
+    BULLET: config.BP,
+}
+
+class Asset(NamedTuple):
+    handle: str
+    path: str
+
+_assets: Dict[str, Optional[Asset]] = {}
+_image_info: Dict[str, dict] = {}
+_lock = threading.Lock()
+
+def _load(handle: str) -> Optional[Asset]:
+    path = os.path.abspath(_SOURCES[handle])
+    if not os.path.exists(path):
+        return None
+    return Asset(handle, path)
+
+def get(handle: str) -> Optional[Asset]:
+    """Return a resolved asset, or None if its file does not exist"""
+    with _lock:
+        if handle not in _assets:
+            _assets[handle] = _load(handle)
+        return _assets[handle]
+
+def path(handle: str) -> Optional[str]:
+    """Absolute path of an asset, or None if it is missing"""
+    asset = get(handle)
+    return asset.path if asset else None
+
+def preload():
+    """Resolve every asset up front (called when a render worker starts)"""
+    for handle in _SOURCES:
+        get(handle)
+
+def image(pdf, handle: str, *args, **kwargs) -> bool:
+    """Draw an image asset on the PDF; returns False if the asset is unavailable"""
+    asset = get(handle)
+    if asset is None:
+        return False
+    
+    images = getattr(pdf, "images", None)
+    if isinstance(images, dict) and asset.path not in images:
+        with _lock:
+            info = _image_info.get(asset.path)
+        if info is not None:
+            # Reuse the decoded image instead of parsing the file again
+            info = dict(info)
+            info["i"] = len(images) + 1
+            images[asset.path] = info
+    
+    pdf.image(asset.path, *args, **kwargs)
+    
+    if isinstance(images, dict) and asset.path in images:
+        with _lock:
+            if asset.path not in _image_info:
+                info = dict(images[asset.path])
+                info.pop("i", None)
+                info.pop("n", None)
+                _image_info[asset.path] = info
+    return True
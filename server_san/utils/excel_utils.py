@@ -1,128 +1,135 @@
 import pandas as pd
-import io
-from typing import List, Dict, Any
-import config
+from typing import List, Dict, Any, Optional, Tuple
+from utils import sheet_cache
+from utils.cache_utils import file_sha256
 
-def load_skill_matrix(file_path: str) -> List[dict]:
-    """Load and process skill matrix Excel file from path"""
-    config.sheets_data = []
+# Standardized and possible original column names for employee names
+FIRST_NAME_KEYS = ["First_Name", "First Name"]
+LAST_NAME_KEYS = ["Last_Name", "Last Name"]
+
+def _standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Rename the first four columns to the standardized skill matrix names"""
+    if len(df.columns) >= 4:
+        # Create standardized column names
+        std_columns = ['First_Name', 'Last_Name', 'Experience', 'Expertise'] + list(df.columns[4:])
+        
+        # Map original columns to standardized names
+        column_mapping = {original: standard for original, standard in zip(df.columns, std_columns)}
+        df = df.rename(columns=column_mapping)
+    return df
+
+def _sheet_records(df: pd.DataFrame, first_id: int) -> List[dict]:
+    """Convert a sheet to records column-wise, assigning consecutive IDs from first_id"""
+    # Purely numeric sheets with mixed dtypes were upcast to a common dtype by the
+    # old row-by-row conversion; keep that so output stays identical
+    if df.dtypes.nunique() > 1 and all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes):
+        df = df.astype(df.values.dtype)
     
-    # Load Excel file
-    xls = pd.ExcelFile(file_path)
+    ids = range(first_id, first_id + len(df))
+    return [{"ID": record_id, **row} for record_id, row in zip(ids, df.to_dict("records"))]
+
+def _parse_frames(xls: pd.ExcelFile) -> List[Tuple[str, pd.DataFrame]]:
+    """Parse every sheet except the first into column-standardized DataFrames"""
+    # Process all sheets from the second one onward
+    return [
+        (sheet_name, _standardize_columns(pd.read_excel(xls, sheet_name=sheet_name)))
+        for sheet_name in xls.sheet_names[1:]  # Skip the first sheet
+    ]
+
+def _build_sheets(frames: List[Tuple[str, pd.DataFrame]]) -> List[dict]:
+    """Convert parsed sheets into records with unique IDs"""
+    sheets_data = []
     record_id = 1  # Unique number for each entry
     
-    # Process all sheets from the second one onward
-    for sheet_name in xls.sheet_names[1:]:  # Skip the first sheet
-        df = pd.read_excel(xls, sheet_name=sheet_name)
-        
-        # Standardize column names to ensure consistency
-        if len(df.columns) >= 4:
-            # Create standardized column names
-            std_columns = ['First_Name', 'Last_Name', 'Experience', 'Expertise'] + list(df.columns[4:])
-            
-            # Map original columns to standardized names
-            column_mapping = {original: standard for original, standard in zip(df.columns, std_columns)}
-            df = df.rename(columns=column_mapping)
+    for sheet_name, df in frames:
+        records = _sheet_records(df, record_id)
+        record_id += len(records)
         
-        # Convert each sheet's data to a list of dictionaries with unique numbers
-        records = []
-        for _, row in df.iterrows():
-            record = {"ID": record_id}  # Assign a unique ID
-            record.update(row.to_dict())  # Convert row data to dictionary
-            records.append(record)
-            record_id += 1  # Increment unique ID
-        
-        sheet_dict = {
+        sheets_data.append({
             "Sheet Name": sheet_name,
             "Data": records
-        }
-        
-        config.sheets_data.append(sheet_dict)
+        })
     
-    return config.sheets_data
+    return sheets_data
 
-def load_skill_matrix_from_bytes(file_content: bytes) -> List[dict]:
-    """Load and process skill matrix Excel file from bytes"""
-    # Clear existing data
-    config.sheets_data = []
+def _load_sheets(xls: pd.ExcelFile) -> List[dict]:
+    """Load every sheet except the first into records with unique IDs"""
+    return _build_sheets(_parse_frames(xls))
+
+def _load_frames_cached(digest: str, open_workbook) -> List[Tuple[str, pd.DataFrame]]:
+    """Return parsed sheets from the columnar cache, parsing the workbook only on a miss"""
+    frames = sheet_cache.load(digest)
+    if frames is not None:
+        print(f"Loaded skill matrix {digest[:12]} from cache")
+        return frames
     
-    # Load Excel file from bytes
-    xls = pd.ExcelFile(io.BytesIO(file_content))
-    record_id = 1  # Unique number for each entry
+    xls = open_workbook()
     
     # Debug output
     print(f"Processing Excel file with sheets: {xls.sheet_names}")
     
-    # Process all sheets from the second one onward
-    for sheet_name in xls.sheet_names[1:]:  # Skip the first sheet
-        df = pd.read_excel(xls, sheet_name=sheet_name)
-        
-        # Standardize column names to ensure consistency
-        if len(df.columns) >= 4:
-            # Create standardized column names
-            std_columns = ['First_Name', 'Last_Name', 'Experience', 'Expertise'] + list(df.columns[4:])
-            
-            # Map original columns to standardized names
-            column_mapping = {original: standard for original, standard in zip(df.columns, std_columns)}
-            df = df.rename(columns=column_mapping)
-        
-        # Convert each sheet's data to a list of dictionaries with unique numbers
-        records = []
-        for _, row in df.iterrows():
-            record = {"ID": record_id}  # Assign a unique ID
-            record.update(row.to_dict())  # Convert row data to dictionary
-            records.append(record)
-            record_id += 1  # Increment unique ID
-        
-        sheet_dict = {
-            "Sheet Name": sheet_name,
-            "Data": records
-        }
-        
-        config.sheets_data.append(sheet_dict)
-    
-    return config.sheets_data
+    frames = _parse_frames(xls)
+    sheet_cache.store(digest, frames)
+    return frames
 
-def get_json_by_name(first_name: str, last_name: str) -> List[dict]:
-    """Search for records by first and last name"""
-    results = []
-    for sheet in config.sheets_data:
-        for record in sheet["Data"]:
-            # Check both standardized and possible original column names with case insensitivity
-            fn_keys = ["First_Name", "First Name"] 
-            ln_keys = ["Last_Name", "Last Name"]
-            
-            fn_match = False
-            for key in fn_keys:
-                if key in record and isinstance(record[key], str) and record[key].lower() == first_name.lower():
-                    fn_match = True
-                    break
-            
-            ln_match = False
-            for key in ln_keys:
-                if key in record and isinstance(record[key], str) and record[key].lower() == last_name.lower():
-                    ln_match = True
-                    break
-            
-            if fn_match and ln_match:
-                # Include sheet name in record for context
-                record_with_sheet = record.copy()
-                record_with_sheet["Sheet Name"] = sheet["Sheet Name"]
-                results.append(record_with_sheet)
+def read_skill_matrix(file_path: str, digest: Optional[str] = None) -> Tuple[str, List[dict]]:
+    """Load and process skill matrix Excel file from path; returns (content hash, sheets)"""
+    digest = digest or file_sha256(file_path)
+    frames = _load_frames_cached(digest, lambda: pd.ExcelFile(file_path))
+    return digest, _build_sheets(frames)
+
+def get_employee_name(record: dict) -> Tuple[Optional[str], Optional[str]]:
+    """Return (first_name, last_name) of a record, checking standardized and original column names"""
+    first_name = None
+    for key in FIRST_NAME_KEYS:
+        if key in record and isinstance(record[key], str):
+            first_name = record[key]
+            break
     
-    return results
+    last_name = None
+    for key in LAST_NAME_KEYS:
+        if key in record and isinstance(record[key], str):
+            last_name = record[key]
+            break
+    
+    return first_name, last_name
 
-def get_json_by_id(employee_id: int) -> List[dict]:
-    """Search for records by employee ID"""
-    results = []
-    for sheet in config.sheets_data:
-        for record in sheet["Data"]:
-            if "ID" in record and record["ID"] == employee_id:
+class SkillMatrixIndex:
+    """Lookup indexes over loaded sheets: ID -> record and lowercased (first, last) -> records
+    
+    The index keeps its own copy of the sheets (records copied, Data as a tuple), so
+    changes to the list passed in cannot leave lookups and sheets_data out of sync.
+    Loading a changed skill matrix builds a new index.
+    """
+    
+    def __init__(self, sheets_data: List[dict]):
+        self.sheets_data = tuple(
+            {"Sheet Name": sheet["Sheet Name"], "Data": tuple(record.copy() for record in sheet["Data"])}
+            for sheet in sheets_data
+        )
+        self.by_id: Dict[Any, dict] = {}
+        self.by_name: Dict[Tuple[str, str], List[dict]] = {}
+        
+        for sheet in self.sheets_data:
+            for record in sheet["Data"]:
                 # Include sheet name in record for context
                 record_with_sheet = record.copy()
                 record_with_sheet["Sheet Name"] = sheet["Sheet Name"]
-                results.append(record_with_sheet)
-                # Since ID should be unique, we can break after finding the match
-                return results
+                
+                # IDs are unique; keep the first record like the original scan did
+                if "ID" in record:
+                    self.by_id.setdefault(record["ID"], record_with_sheet)
+                
+                # Index every combination of standardized and original name columns
+                first_names = {record[key].lower() for key in FIRST_NAME_KEYS if key in record and isinstance(record[key], str)}
+                last_names = {record[key].lower() for key in LAST_NAME_KEYS if key in record and isinstance(record[key], str)}
+                for first in first_names:
+                    for last in last_names:
+                        self.by_name.setdefault((first, last), []).append(record_with_sheet)
+    
+    def find_by_name(self, first_name: str, last_name: str) -> List[dict]:
+        return [record.copy() for record in self.by_name.get((first_name.lower(), last_name.lower()), [])]
     
-    return results
\ No newline at end of file
+    def find_by_id(self, employee_id: int) -> List[dict]:
+        record = self.by_id.get(employee_id)
+        return [record.copy()] if record is not None else []
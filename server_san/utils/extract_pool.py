@@ -0,0 +1,98 @@
+"""
+Process pool for CPU-bound document text extraction.
+
+PyMuPDF and python-docx parsing hold the GIL, so extraction is sent to a
+pool of EXTRACT_WORKERS processes that are started (and have the parsers
+imported) at application startup. PDFs with at least
+EXTRACT_PARALLEL_MIN_PAGES pages are split into page ranges that are
+extracted concurrently and joined back in page order. With the pool
+disabled or not started, extraction falls back to the API threadpool.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+import config
+from utils import file_utils
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+def _warm_worker():
+    """Process initializer: import the parsers once per worker"""
+    import fitz  # noqa: F401
+    import docx  # noqa: F401
+
+def _ping() -> bool:
+    return True
+
+def start():
+    """Start the extraction workers"""
+    global _executor
+    if _executor is not None or config.EXTRACT_WORKERS <= 0:
+        return
+    _executor = ProcessPoolExecutor(
+        max_workers=config.EXTRACT_WORKERS,
+        mp_context=multiprocessing.get_context(config.WORKER_START_METHOD),
+        initializer=_warm_worker,
+    )
+    # Spawn every worker now rather than on the first upload
+    for future in [_executor.submit(_ping) for _ in range(config.EXTRACT_WORKERS)]:
+        future.result()
+    logger.info(f"Started {config.EXTRACT_WORKERS} extraction workers")
+
+def stop():
+    """Shut the extraction workers down"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+def page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    """Split [0, page_count) into at most `parts` contiguous ranges of near-equal size"""
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for index in range(parts):
+        stop = start + size + (1 if index < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+async def _extract_pdf_parallel(file_path: str, page_count: int, max_chars: Optional[int]) -> str:
+    loop = asyncio.get_running_loop()
+    futures = [
+        loop.run_in_executor(_executor, file_utils.extract_pdf_page_range, file_path, start, stop)
+        for start, stop in page_ranges(page_count, config.EXTRACT_WORKERS)
+    ]
+    # gather keeps the results in page order
+    parts = await asyncio.gather(*futures)
+    return file_utils.join_chunks(iter(parts), max_chars)
+
+async def extract_text(file_path: str) -> str:
+    """Extract the text of a document off the event loop, in parallel for large PDFs"""
+    if _executor is None:
+        return await run_in_threadpool(file_utils.extract_text_from_file, file_path)
+
+    try:
+        if file_path.lower().endswith('.pdf'):
+            max_pages, max_chars = file_utils.extraction_budgets()
+            page_count = await run_in_threadpool(file_utils.pdf_page_count, file_path)
+            if max_pages is not None:
+                page_count = min(page_count, max_pages)
+            if page_count >= config.EXTRACT_PARALLEL_MIN_PAGES and config.EXTRACT_WORKERS > 1:
+                return await _extract_pdf_parallel(file_path, page_count, max_chars)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, file_utils.extract_text_from_file, file_path)
+    except BrokenProcessPool:
+        logger.error("Extraction worker pool is broken, extracting in the API threadpool")
+        return await run_in_threadpool(file_utils.extract_text_from_file, file_path)
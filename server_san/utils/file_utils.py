@@ -1,50 +1,95 @@
 import fitz  # PyMuPDF
 from docx import Document
 import io
+from typing import Iterator, Optional
+import config
 
-def extract_text_from_file(file_path: str) -> str:
-    """Extract text from various file formats using file path"""
+# Read size for plain text files
+TXT_CHUNK_SIZE = 64 * 1024
+
+def _budget(value: Optional[int], default: int) -> Optional[int]:
+    """Resolve a page/character budget; 0 or negative means unlimited"""
+    value = default if value is None else value
+    return value if value and value > 0 else None
+
+def _iter_pdf_pages(doc, max_pages: Optional[int]) -> Iterator[str]:
+    with doc:
+        for page_number, page in enumerate(doc):
+            if max_pages is not None and page_number >= max_pages:
+                break
+            yield page.get_text("text")
+
+def _iter_docx_paragraphs(doc) -> Iterator[str]:
+    for paragraph in doc.paragraphs:
+        yield paragraph.text + '\n'
+
+def iter_text_chunks(file_path: str, max_pages: Optional[int] = None) -> Iterator[str]:
+    """Yield text page by page (PDF), paragraph by paragraph (DOCX) or in fixed-size chunks (TXT)"""
     file_extension = file_path.split('.')[-1].lower()
-    text = ''
-    
+
     if file_extension == 'pdf':
-        # Extract text from PDF using PyMuPDF
-        with open(file_path, 'rb') as file:
-            doc = fitz.open(stream=file.read(), filetype='pdf')
-            for page in doc:
-                text += page.get_text("text")
+        # PyMuPDF opens the file by path and loads pages lazily
+        yield from _iter_pdf_pages(fitz.open(file_path), max_pages)
     elif file_extension == 'docx':
-        # Extract text from DOCX
-        doc = Document(file_path)
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + '\n'
+        yield from _iter_docx_paragraphs(Document(file_path))
     elif file_extension == 'txt':
-        # Extract text from TXT
         with open(file_path, 'r', encoding='utf-8') as file:
-            text = file.read()
+            for chunk in iter(lambda: file.read(TXT_CHUNK_SIZE), ''):
+                yield chunk
     else:
         raise ValueError('Unsupported file format. Please provide PDF, DOCX, or TXT files.')
-    
-    return text
+
+def join_chunks(chunks: Iterator[str], max_chars: Optional[int] = None) -> str:
+    """Concatenate text chunks once, stopping as soon as the character budget is reached"""
+    parts = []
+    total = 0
+    try:
+        for chunk in chunks:
+            if max_chars is not None and total + len(chunk) >= max_chars:
+                parts.append(chunk[:max_chars - total])
+                break
+            parts.append(chunk)
+            total += len(chunk)
+    finally:
+        # Close generators early so open documents are released
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+    return ''.join(parts)
+
+def extraction_budgets(max_pages: Optional[int] = None, max_chars: Optional[int] = None):
+    """Resolve (max_pages, max_chars) against the configured defaults; None means unlimited"""
+    return _budget(max_pages, config.EXTRACT_MAX_PAGES), _budget(max_chars, config.EXTRACT_MAX_CHARS)
+
+def pdf_page_count(file_path: str) -> int:
+    """Number of pages in a PDF, without extracting any text"""
+    with fitz.open(file_path) as doc:
+        return doc.page_count
+
+def extract_pdf_page_range(file_path: str, start: int, stop: int) -> str:
+    """Extract the text of pages [start, stop) of a PDF"""
+    with fitz.open(file_path) as doc:
+        return ''.join(doc[page_number].get_text("text") for page_number in range(start, min(stop, doc.page_count)))
+
+def extract_text_from_file(file_path: str, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> str:
+    """Extract text from various file formats using file path"""
+    max_pages, max_chars = extraction_budgets(max_pages, max_chars)
+    return join_chunks(iter_text_chunks(file_path, max_pages), max_chars)
 
 def extract_text_from_bytes(file_content: bytes, file_extension: str) -> str:
     """Extract text from various file formats using file bytes"""
-    text = ''
-    
+    max_pages, max_chars = extraction_budgets()
+
     if file_extension == 'pdf':
         # Extract text from PDF using PyMuPDF
-        doc = fitz.open(stream=file_content, filetype='pdf')
-        for page in doc:
-            text += page.get_text("text")
+        chunks = _iter_pdf_pages(fitz.open(stream=file_content, filetype='pdf'), max_pages)
     elif file_extension == 'docx':
         # Extract text from DOCX
-        doc = Document(io.BytesIO(file_content))
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + '\n'
+        chunks = _iter_docx_paragraphs(Document(io.BytesIO(file_content)))
     elif file_extension == 'txt':
         # Extract text from TXT
-        text = file_content.decode('utf-8')
+        chunks = iter([file_content.decode('utf-8')])
     else:
         raise ValueError('Unsupported file format. Please provide PDF, DOCX, or TXT files.')
-    
-    return text
\ No newline at end of file
+
+    return join_chunks(chunks, max_chars)
@@ -0,0 +1,45 @@
+"""
+Allocation of output paths for rendered documents.
+
+Templates name their files after the candidate (and error PDFs use fixed
+names), so two renders at the same time would write the same file. Every
+render instead gets its own directory under RENDER_DIR, keeping the
+template's filename, and files are written to a temporary name and renamed
+into place so readers never see a partial PDF.
+"""
+
+import os
+import uuid
+from typing import Callable
+
+import config
+
+def allocate(filename: str) -> str:
+    """Return a fresh, collision-free path for a file with the given name"""
+    directory = os.path.join(config.RENDER_DIR, uuid.uuid4().hex)
+    os.makedirs(directory)
+    return os.path.join(directory, os.path.basename(filename))
+
+def write_atomic(path: str, write: Callable[[str], None]) -> str:
+    """Call write(temp_path), then rename the result to path"""
+    temp_path = f"{path}.{uuid.uuid4().hex}.part"
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return path
+
+def release(path: str):
+    """Remove an allocated file's directory once the file has been moved or deleted"""
+    directory = os.path.dirname(os.path.abspath(path))
+    if os.path.dirname(directory) != os.path.abspath(config.RENDER_DIR):
+        return
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+        os.rmdir(directory)
+    except OSError:
+        pass
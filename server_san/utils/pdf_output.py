@@ -0,0 +1,59 @@
+"""
+Common output step for the PDF templates.
+
+Every template ends with finalize(pdf, output_path). Normally that writes
+the PDF atomically to a per-render path with output_path's filename (see
+output_allocator); inside an in_memory() block the rendered bytes are
+captured instead and nothing touches the disk, so callers can stream the
+PDF straight into a response.
+"""
+
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from . import output_allocator
+
+class PDFCapture:
+    """Bytes of the PDF finalized inside an in_memory() block"""
+
+    def __init__(self):
+        self.filename: Optional[str] = None
+        self.data: Optional[bytes] = None
+
+_capture: ContextVar[Optional[PDFCapture]] = ContextVar("pdf_capture", default=None)
+
+def pdf_bytes(pdf) -> bytes:
+    """Render an FPDF document to bytes (pyfpdf returns latin-1 str, fpdf2 a bytearray)"""
+    data = pdf.output(dest='S')
+    if isinstance(data, str):
+        data = data.encode('latin-1')
+    return bytes(data)
+
+@contextmanager
+def in_memory() -> Iterator[PDFCapture]:
+    """Capture the next finalized PDF in memory instead of writing it to disk"""
+    capture = PDFCapture()
+    token = _capture.set(capture)
+    try:
+        yield capture
+    finally:
+        _capture.reset(token)
+
+def capturing() -> bool:
+    """True inside an in_memory() block"""
+    return _capture.get() is not None
+
+def finalize(pdf, output_path: str) -> str:
+    """
+    Write the PDF under a unique path named like output_path and return that path,
+    or capture its bytes in in-memory mode (returning output_path unchanged)
+    """
+    capture = _capture.get()
+    if capture is not None:
+        capture.filename = os.path.basename(output_path)
+        capture.data = pdf_bytes(pdf)
+        return output_path
+    path = output_allocator.allocate(os.path.basename(output_path))
+    return output_allocator.write_atomic(path, lambda temp_path: pdf.output(temp_path))
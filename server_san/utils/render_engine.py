@@ -0,0 +1,147 @@
+"""
+Process-pool PDF rendering for template_manager.
+
+FPDF rendering is pure-Python CPU work, so resumes and cover letters are
+rendered in a pool of RENDER_WORKERS processes. Workers import every
+template module and read the logo, bullet image and fonts once at startup.
+A render takes (template_id, resume_data) and returns either the path of
+the written PDF or, in memory mode, (filename, PDF bytes). Queue depth and
+per-template latency are tracked for the metrics endpoint. With the pool
+disabled or not started, renders run in the API threadpool.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+import config
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_metrics_lock = threading.Lock()
+_in_flight = 0
+_completed = 0
+_failed = 0
+_template_latency: Dict[str, Dict[str, float]] = {}
+
+def _warm_worker():
+    """Process initializer: import the templates and load their assets"""
+    from utils import assets, template_manager  # noqa: F401
+    assets.preload()
+
+def _ping() -> bool:
+    return True
+
+def _timed(render: Callable, *args):
+    started = time.perf_counter()
+    result = render(*args)
+    return result, time.perf_counter() - started
+
+def _render_resume(template_id: int, resume_data: Any, in_memory: bool, strict: bool = False):
+    from utils import template_manager
+    if in_memory:
+        return _timed(template_manager.render_resume_bytes, resume_data, template_id, strict)
+    return _timed(template_manager.generate_resume, resume_data, template_id)
+
+def _render_cover_letter(template_id: int, resume_data: Any, cover_letter_text: str, in_memory: bool):
+    from utils import template_manager
+    if in_memory:
+        return _timed(template_manager.render_cover_letter_bytes, resume_data, cover_letter_text, template_id)
+    return _timed(template_manager.generate_cover_letter, resume_data, cover_letter_text, template_id)
+
+def start():
+    """Start the render workers"""
+    global _executor
+    if _executor is not None or config.RENDER_WORKERS <= 0:
+        return
+    _executor = ProcessPoolExecutor(
+        max_workers=config.RENDER_WORKERS,
+        mp_context=multiprocessing.get_context(config.WORKER_START_METHOD),
+        initializer=_warm_worker,
+    )
+    # Spawn every worker now rather than on the first render
+    for future in [_executor.submit(_ping) for _ in range(config.RENDER_WORKERS)]:
+        future.result()
+    logger.info(f"Started {config.RENDER_WORKERS} render workers")
+
+def stop():
+    """Shut the render workers down"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+def _record(key: str, total_seconds: float, render_seconds: Optional[float]):
+    global _in_flight, _completed, _failed
+    with _metrics_lock:
+        _in_flight -= 1
+        if render_seconds is None:
+            _failed += 1
+            return
+        _completed += 1
+        stats = _template_latency.setdefault(key, {"count": 0, "total_ms": 0.0, "render_ms": 0.0, "max_ms": 0.0})
+        stats["count"] += 1
+        stats["total_ms"] += total_seconds * 1000
+        stats["render_ms"] += render_seconds * 1000
+        stats["max_ms"] = max(stats["max_ms"], total_seconds * 1000)
+
+async def _submit(key: str, render: Callable, *args):
+    global _in_flight
+    with _metrics_lock:
+        _in_flight += 1
+    started = time.perf_counter()
+    render_seconds = None
+    try:
+        if _executor is None:
+            result, render_seconds = await run_in_threadpool(render, *args)
+        else:
+            try:
+                loop = asyncio.get_running_loop()
+                result, render_seconds = await loop.run_in_executor(_executor, render, *args)
+            except BrokenProcessPool:
+                logger.error("Render worker pool is broken, rendering in the API threadpool")
+                result, render_seconds = await run_in_threadpool(render, *args)
+        return result
+    finally:
+        _record(key, time.perf_counter() - started, render_seconds)
+
+async def render_resume(template_id: int, resume_data: Any, in_memory: bool = False, strict: bool = False):
+    """Render a resume; returns the PDF path, or (filename, bytes) when in_memory.
+    strict (in_memory only) raises if the template fell back to its error PDF"""
+    return await _submit(f"resume:{template_id}", _render_resume, template_id, resume_data, in_memory, strict)
+
+async def render_cover_letter(template_id: int, resume_data: Any, cover_letter_text: str, in_memory: bool = False):
+    """Render a cover letter; returns the PDF path, or (filename, bytes) when in_memory"""
+    return await _submit(
+        f"cover_letter:{template_id}", _render_cover_letter, template_id, resume_data, cover_letter_text, in_memory
+    )
+
+def get_metrics() -> Dict:
+    """Queue depth, totals and per-template average latency (queue wait included in total_ms)"""
+    workers = config.RENDER_WORKERS if _executor is not None else 0
+    with _metrics_lock:
+        templates = {
+            key: {
+                "count": stats["count"],
+                "avg_total_ms": round(stats["total_ms"] / stats["count"], 1),
+                "avg_render_ms": round(stats["render_ms"] / stats["count"], 1),
+                "max_total_ms": round(stats["max_ms"], 1),
+            }
+            for key, stats in _template_latency.items()
+        }
+        return {
+            "workers": workers,
+            "in_flight": _in_flight,
+            "queue_depth": max(0, _in_flight - workers) if workers else 0,
+            "completed": _completed,
+            "failed": _failed,
+            "templates": templates,
+        }
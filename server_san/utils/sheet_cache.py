@@ -0,0 +1,182 @@
+"""
+On-disk cache of parsed skill matrix sheets.
+
+Parsing .xlsx XML is the slowest part of a skill matrix upload, so the
+parsed (column-standardized) sheets are stored as uncompressed Arrow IPC
+(Feather v2) files keyed by the SHA-256 of the workbook. A later upload of
+the same file, or a restart, memory-maps those files instead of reparsing.
+Object columns (cells of mixed types, e.g. names next to numbers) cannot be
+stored as one Arrow type, so each of their cells is written as a small
+type-tagged JSON string and decoded back to the identical Python value.
+
+pyarrow is optional: without it the cache is disabled and every load parses
+the workbook as before.
+"""
+
+import datetime
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import config
+from utils.cache_utils import touch
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - optional dependency
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+FORMAT_VERSION = 2
+
+Frames = List[Tuple[str, pd.DataFrame]]
+
+def _encode_cell(value: Any) -> str:
+    """Type-tagged JSON for one cell of an object column"""
+    # bool before int (bool is an int subclass), Timestamp before datetime (and datetime before date)
+    if value is None:
+        tagged = ["none"]
+    elif value is pd.NaT:
+        tagged = ["nat"]
+    elif isinstance(value, str):
+        tagged = ["str", value]
+    elif isinstance(value, (bool, np.bool_)):
+        tagged = ["bool" if isinstance(value, bool) else "np_bool", bool(value)]
+    elif isinstance(value, int):
+        tagged = ["int", value]
+    elif isinstance(value, np.integer):
+        tagged = ["np_int", value.dtype.str, int(value)]
+    elif isinstance(value, float):
+        tagged = ["float", repr(value)]
+    elif isinstance(value, np.floating):
+        tagged = ["np_float", value.dtype.str, repr(float(value))]
+    elif isinstance(value, pd.Timestamp):
+        tagged = ["timestamp", value.isoformat()]
+    elif isinstance(value, datetime.datetime):
+        tagged = ["datetime", value.isoformat()]
+    elif isinstance(value, datetime.date):
+        tagged = ["date", value.isoformat()]
+    elif isinstance(value, datetime.time):
+        tagged = ["time", value.isoformat()]
+    else:
+        raise TypeError(f"cannot cache cell of type {type(value).__name__}")
+    return json.dumps(tagged)
+
+def _decode_cell(encoded: str) -> Any:
+    tag, *args = json.loads(encoded)
+    if tag == "none":
+        return None
+    if tag == "nat":
+        return pd.NaT
+    if tag in ("str", "bool", "int"):
+        return args[0]
+    if tag == "np_bool":
+        return np.bool_(args[0])
+    if tag == "np_int":
+        return np.dtype(args[0]).type(args[1])
+    if tag == "float":
+        return float(args[0])
+    if tag == "np_float":
+        return np.dtype(args[0]).type(float(args[1]))
+    if tag == "timestamp":
+        return pd.Timestamp(args[0])
+    if tag == "datetime":
+        return datetime.datetime.fromisoformat(args[0])
+    if tag == "date":
+        return datetime.date.fromisoformat(args[0])
+    if tag == "time":
+        return datetime.time.fromisoformat(args[0])
+    raise ValueError(f"unknown cell tag {tag!r}")
+
+def _encode_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+    """Replace object columns with tagged strings; returns (frame, encoded column names)"""
+    encoded = [column for column in df.columns if df[column].dtype == object]
+    if not encoded:
+        return df, encoded
+    df = df.copy()
+    for column in encoded:
+        df[column] = pd.Series([_encode_cell(value) for value in df[column]], index=df.index, dtype=object)
+    return df, encoded
+
+def _decode_frame(df: pd.DataFrame, encoded: List[str]) -> pd.DataFrame:
+    for column in encoded:
+        df[column] = pd.Series([_decode_cell(value) for value in df[column]], index=df.index, dtype=object)
+    return df
+
+def _cache_root() -> str:
+    return os.path.join(config.CACHE_DIR, "skill_matrix")
+
+def is_enabled() -> bool:
+    return feather is not None and config.SKILL_MATRIX_CACHE_ENABLED
+
+def load(digest: str) -> Optional[Frames]:
+    """Return the cached sheets for a workbook hash, or None on a miss"""
+    if not is_enabled():
+        return None
+    
+    directory = os.path.join(_cache_root(), digest)
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+    
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != FORMAT_VERSION:
+            return None
+        
+        touch(directory)
+        frames = []
+        for sheet in manifest["sheets"]:
+            table = feather.read_table(os.path.join(directory, sheet["file"]), memory_map=True)
+            frames.append((sheet["name"], _decode_frame(table.to_pandas(), sheet["encoded"])))
+        return frames
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable skill matrix cache entry {digest}: {str(e)}")
+        return None
+
+def store(digest: str, frames: Frames):
+    """Persist parsed sheets; workbooks with cells of unsupported types are simply not cached"""
+    if not is_enabled():
+        return
+    
+    root = _cache_root()
+    os.makedirs(root, exist_ok=True)
+    directory = os.path.join(root, digest)
+    if os.path.exists(directory):
+        return
+    
+    # Write into a temp directory and rename it into place so readers never see a partial entry
+    tmp_directory = tempfile.mkdtemp(dir=root, prefix=".tmp-")
+    try:
+        sheets = []
+        for index, (sheet_name, df) in enumerate(frames):
+            if not all(isinstance(column, str) for column in df.columns):
+                logger.info(f"Not caching skill matrix {digest}: sheet {sheet_name!r} has non-text headers")
+                return
+            file_name = f"{index:04d}.arrow"
+            df, encoded = _encode_frame(df)
+            feather.write_feather(df, os.path.join(tmp_directory, file_name), compression="uncompressed")
+            sheets.append({"name": sheet_name, "file": file_name, "encoded": encoded})
+        
+        with open(os.path.join(tmp_directory, MANIFEST_NAME), "w") as f:
+            json.dump({"version": FORMAT_VERSION, "sheets": sheets}, f)
+        os.replace(tmp_directory, directory)
+    except OSError as e:
+        # Another worker may have stored the same workbook first
+        if not os.path.exists(directory):
+            logger.warning(f"Could not cache skill matrix {digest}: {str(e)}")
+    except Exception as e:
+        # Cells of a type _encode_cell does not know, or a column Arrow cannot convert
+        logger.info(f"Not caching skill matrix {digest}: {str(e)}")
+    finally:
+        if os.path.exists(tmp_directory):
+            shutil.rmtree(tmp_directory, ignore_errors=True)
@@ -9,6 +9,8 @@ import re
 import json
 import os
 import config
+from .pdf_output import finalize
+from . import assets
 
 
 class ResumePDF(FPDF):
@@ -17,8 +19,6 @@ class ResumePDF(FPDF):
         super().__init__()
         self.first_page = True  # Track if it's the first page
 
-        self.bullet_image_path = config.BP
-
     def clean_text(self, text):
         if not isinstance(text, str):
             text = str(text)
@@ -65,14 +65,9 @@ class ResumePDF(FPDF):
             return  
 
         try:
-            if os.path.exists(self.bullet_image_path):
-                # Print debug info when successfully finding the image
-                print(f"Found bullet image at: {self.bullet_image_path}")
-                self.image(self.bullet_image_path, x=self.get_x(), y=self.get_y(), w=5, h=5)
+            if assets.image(self, assets.BULLET, x=self.get_x(), y=self.get_y(), w=5, h=5):
                 self.cell(6)  # Space between bullet and text
             else:
-                # Print debug info when image not found
-                print(f"Bullet image not found at: {self.bullet_image_path}")
                 self.cell(5, 6, "•", ln=False)  # Unicode bullet fallback
         except Exception as e:
             # Print any exceptions that occur
@@ -265,5 +260,4 @@ def generate_resume_2(data):
         
     filename = f"{safe_name}_Resume.pdf"
     output_path = os.path.join(config.OUTPUT_DIR, filename)
-    pdf.output(output_path)
-    return output_path
\ No newline at end of file
+    return finalize(pdf, output_path)
\ No newline at end of file
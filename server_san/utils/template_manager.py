@@ -7,11 +7,12 @@ Template manager module to handle different PDF resume and cover letter template
 
 import os
 import json
-from typing import Dict, Any, Callable, Optional, List
+from typing import Dict, Any, Callable, Optional, List, Tuple
 import config
+from .pdf_output import capturing, finalize, in_memory
 
 # Import all template functions
-from .templete_1 import generate_resume_1, generate_cover_letter_pdf
+from .templete_1 import generate_resume_1, generate_cover_letter_pdf, RESUME_ERROR_FILENAME
 from .template_2 import generate_resume_2
 from .templete_3 import generate_resume_3, generate_cover_letter_3
 from .templete_4 import generate_resume_4,generate_cover_letter_4
@@ -346,8 +347,7 @@ def generate_cover_letter_2(data, cover_letter_text):
     # Save the file
     filename = f"{pdf.name.replace(' ', '_')}_Cover_Letter.pdf"
     output_path = os.path.join(config.OUTPUT_DIR, filename)
-    pdf.output(output_path)
-    return output_path
+    return finalize(pdf, output_path)
 
 # Dictionary to store available cover letter templates
 COVER_LETTER_TEMPLATES = {
@@ -412,7 +412,10 @@ def generate_resume(data: Any, template_id: int = 1) -> str:
     # Pass data to the template function
     try:
         output_path = template_func(data)
-        print(f"Generated resume PDF: {output_path}")
+        if capturing():
+            print(f"Generated resume PDF in memory: {os.path.basename(output_path)}")
+        else:
+            print(f"Generated resume PDF: {output_path}")
         
         # Ensure the file is in the output directory
         if not output_path.startswith(config.OUTPUT_DIR):
@@ -486,4 +489,23 @@ def generate_cover_letter(data: Any, cover_letter_text: str, template_id: int =
         return output_path
     except Exception as e:
         print(f"Error generating cover letter with template {template_id}: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+def render_resume_bytes(data: Any, template_id: int = 1, strict: bool = False) -> Tuple[str, bytes]:
+    """Generate a resume in memory; returns (filename, PDF bytes) without writing to disk.
+    With strict=True a template that fell back to its error PDF raises instead"""
+    with in_memory() as capture:
+        generate_resume(data, template_id)
+    if capture.data is None:
+        raise Exception("The resume PDF was not rendered.")
+    if strict and capture.filename == RESUME_ERROR_FILENAME:
+        raise Exception(f"Template {template_id} failed to render the resume.")
+    return capture.filename, capture.data
+
+def render_cover_letter_bytes(data: Any, cover_letter_text: str, template_id: int = 1) -> Tuple[str, bytes]:
+    """Generate a cover letter in memory; returns (filename, PDF bytes) without writing to disk"""
+    with in_memory() as capture:
+        generate_cover_letter(data, cover_letter_text, template_id)
+    if capture.data is None:
+        raise Exception("The cover letter PDF was not rendered.")
+    return capture.filename, capture.data
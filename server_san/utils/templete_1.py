@@ -8,10 +8,15 @@ import traceback
 from .template_2 import generate_resume_2
 #from .template_manager import generate_cover_letter_2
 import config
+from .pdf_output import finalize
+from . import assets
 # from utils.template_pdf import generate_resume_2, generate_cover_letter_2
 import os
 import config
 
+# Names of the placeholder PDFs written when a template fails
+RESUME_ERROR_FILENAME = "Resume_Generation_Error.pdf"
+COVER_LETTER_ERROR_FILENAME = "Cover_Letter_Generation_Error.pdf"
 
 
 def generate_resume(data, template_type=1):
@@ -101,7 +106,7 @@ class PDF(FPDF):
     def header(self):
         """Adds a logo if available."""
         try:
-            self.image(config.LOGO_PATH, 160, 8, 35)
+            assets.image(self, assets.LOGO, 160, 8, 35)
         except:
             pass  # Skip if logo is not found
         self.set_font("Arial", "B", 12)
@@ -268,8 +273,7 @@ def generate_resume_1(data_json: str) -> str:
         safe_name = ''.join(c for c in safe_name if c.isalnum() or c in '._- ')
         filename = os.path.join(config.OUTPUT_DIR, f"{safe_name}_Resume.pdf")
         
-        pdf.output(filename)
-        return filename
+        return finalize(pdf, filename)
     
     except Exception as e:
         print(f"Error in generate_resume_1: {str(e)}")
@@ -285,9 +289,8 @@ def generate_resume_1(data_json: str) -> str:
             pdf.ln(5)
             pdf.multi_cell(0, 7, "Please try again or contact support.")
             
-            error_filename = os.path.join(config.OUTPUT_DIR, "Resume_Generation_Error.pdf")
-            pdf.output(error_filename)
-            return error_filename
+            error_filename = os.path.join(config.OUTPUT_DIR, RESUME_ERROR_FILENAME)
+            return finalize(pdf, error_filename)
         except:
             # If even the error PDF fails, return a path that doesn't exist (will be caught in calling code)
             return os.path.join(config.OUTPUT_DIR, "resume_generation_failed.pdf")
@@ -327,8 +330,7 @@ def generate_cover_letter_pdf(cover_letter_text: str, candidate_name: str) -> st
         
         # Save the cover letter
         filename = os.path.join(config.OUTPUT_DIR, f"{safe_name}_Cover_Letter.pdf")
-        pdf.output(filename)
-        return filename
+        return finalize(pdf, filename)
     
     except Exception as e:
         print(f"Error in generate_cover_letter_pdf: {str(e)}")
@@ -344,9 +346,8 @@ def generate_cover_letter_pdf(cover_letter_text: str, candidate_name: str) -> st
             pdf.ln(5)
             pdf.multi_cell(0, 7, "Please try again or contact support.")
             
-            error_filename = os.path.join(config.OUTPUT_DIR, "Cover_Letter_Generation_Error.pdf")
-            pdf.output(error_filename)
-            return error_filename
+            error_filename = os.path.join(config.OUTPUT_DIR, COVER_LETTER_ERROR_FILENAME)
+            return finalize(pdf, error_filename)
         except:
             # If even the error PDF fails, return a path that doesn't exist (will be caught in calling code)
             return os.path.join(config.OUTPUT_DIR, "cover_letter_generation_failed.pdf")
\ No newline at end of file
@@ -1,4 +1,6 @@
 import config
+from .pdf_output import finalize
+from . import assets
 import json
 import os
 
@@ -8,8 +10,6 @@ from fpdf import FPDF
 import re
 
 class CreativeResumePDF(FPDF):
-    bullet_image_path = "BP.jpeg"  # Ensure this exists in the directory
-    
     def __init__(self):
         super().__init__()
         self.set_margins(10, 10, 10)  # Set left, top, and right margins
@@ -64,8 +64,7 @@ class CreativeResumePDF(FPDF):
         if not text:  # Skip empty entries
             return  
 
-        if os.path.exists(self.bullet_image_path):
-            self.image(self.bullet_image_path, x=self.get_x(), y=self.get_y(), w=5, h=5)
+        if assets.image(self, assets.BULLET, x=self.get_x(), y=self.get_y(), w=5, h=5):
             self.cell(6)  # Space between bullet and text
         else:
             self.cell(5, 6, "•", ln=False)  # Unicode bullet fallback
@@ -317,8 +316,7 @@ def generate_resume_3(data, template_id=3):
     # Generate filename and output PDF
     output_filename = f"{data.get('name', 'Candidate').replace(' ', '_')}_Creative_Resume.pdf"
     output_path = os.path.join(config.OUTPUT_DIR, output_filename)
-    pdf.output(output_path)
-    return output_path
+    return finalize(pdf, output_path)
 # Function to generate a matching cover letter for template 3
 def generate_cover_letter_3(data, cover_letter_text):
     """
@@ -400,5 +398,4 @@ def generate_cover_letter_3(data, cover_letter_text):
     # Save to file
     output_filename = f"{data.get('name', 'Candidate').replace(' ', '_')}_Creative_Cover_Letter.pdf"
     output_path = os.path.join(config.OUTPUT_DIR, output_filename)
-    pdf.output(output_path)
-    return output_path
\ No newline at end of file
+    return finalize(pdf, output_path)
\ No newline at end of file
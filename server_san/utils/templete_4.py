@@ -5,6 +5,7 @@ import unicodedata
 import re
 import os
 import config
+from .pdf_output import finalize
 
 
 class ResumePDF(FPDF):
@@ -320,8 +321,7 @@ def generate_resume_4(data):
         
     filename = f"{safe_name}_Resume.pdf"
     output_path = os.path.join(config.OUTPUT_DIR, filename)
-    pdf.output(output_path)
-    return output_path
+    return finalize(pdf, output_path)
 
 
 def generate_cover_letter_4(data, cover_letter_text):
@@ -413,6 +413,5 @@ def generate_cover_letter_4(data, cover_letter_text):
     # Save to file
     output_filename = f"{data.get('name', 'Candidate').replace(' ', '_')}_Creative_Cover_Letter.pdf"
     output_path = os.path.join(config.OUTPUT_DIR, output_filename)
-    pdf.output(output_path)
-    return output_path
+    return finalize(pdf, output_path)
 
@@ -4,6 +4,7 @@ import unicodedata
 import re
 import os
 import config
+from .pdf_output import finalize
 
 
 
@@ -162,8 +163,7 @@ def generate_resume_5(data):
         
     filename = f"{safe_name}_Resume.pdf"
     output_path = os.path.join(config.OUTPUT_DIR, filename)
-    pdf.output(output_path)
-    return output_path
+    return finalize(pdf, output_path)
 
 # Function to generate a matching cover letter with template 4
 def generate_cover_letter_5(data, cover_letter_text):
@@ -267,5 +267,4 @@ def generate_cover_letter_5(data, cover_letter_text):
     # Save the file
     output_filename = f"{data.get('name', 'Candidate').replace(' ', '_')}_Creative_Cover_Letter.pdf"
     output_path = os.path.join(config.OUTPUT_DIR, output_filename)
-    pdf.output(output_path)
-    return output_path
\ No newline at end of file
+    return finalize(pdf, output_path)
\ No newline at end of file
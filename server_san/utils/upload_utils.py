@@ -0,0 +1,63 @@
+"""
+Streaming upload helpers.
+
+Uploads are copied to disk in UPLOAD_CHUNK_SIZE pieces with async file I/O,
+hashed on the fly and checked against MAX_UPLOAD_BYTES, so memory per
+request stays constant however large the file is. Data is written to a
+temporary file next to the destination and renamed into place only once
+the whole upload has been received.
+"""
+
+import hashlib
+import os
+import uuid
+from typing import Optional, Tuple
+
+import anyio
+from fastapi import HTTPException, UploadFile
+
+import config
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+async def save_upload(file: UploadFile, dest_path: str, max_bytes: Optional[int] = None) -> Tuple[int, str]:
+    """Stream an upload to dest_path; returns (size in bytes, SHA-256 hex digest)"""
+    max_bytes = config.MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    temp_path = f"{dest_path}.{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    
+    try:
+        async with await anyio.open_file(temp_path, "wb") as buffer:
+            while True:
+                chunk = await file.read(config.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_bytes > 0 and size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum upload size is {max_bytes} bytes.",
+                    )
+                digest.update(chunk)
+                await buffer.write(chunk)
+        os.replace(temp_path, dest_path)
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+    
+    return size, digest.hexdigest()
+
+async def save_upload_temp(file: UploadFile, suffix: str = "") -> Tuple[str, str]:
+    """Stream an upload to a private temporary file; returns (path, SHA-256 hex digest)"""
+    temp_path = os.path.join(config.UPLOAD_TMP_DIR, f"{uuid.uuid4().hex}{suffix}")
+    _, digest = await save_upload(file, temp_path)
+    return temp_path, digest
+
+def remove_upload(path: str):
+    """Delete a temporary upload, ignoring files that are already gone"""
+    _remove_quietly(path)